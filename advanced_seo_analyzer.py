@@ -6,9 +6,17 @@ Analyzes websites for SEO, AEO, GEO, performance, accessibility, and more using
 
 import os
 import sys
+import argparse
 import json
+import orjson
+import copy
+import gzip
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+from jinja2 import Environment, FileSystemLoader, ModuleLoader
+from markupsafe import Markup
 from urllib.parse import urljoin, urlparse, parse_qs
 import openai
 from dotenv import load_dotenv
@@ -16,7 +24,12 @@ from datetime import datetime, timedelta
 import re
 import time
 import threading
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from bisect import bisect_left
+from collections import OrderedDict
+from functools import lru_cache
+from operator import itemgetter
+from typing import IO, Dict, List, Any, Optional, Tuple
 import base64
 from io import BytesIO
 import hashlib
@@ -28,7 +41,7 @@ import textstat
 import nltk
 from nltk.sentiment import SentimentIntensityAnalyzer
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize, sent_tokenize
+from nltk.tokenize import word_tokenize
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.cluster import KMeans
 from wordcloud import WordCloud
@@ -42,17 +55,718 @@ from spellchecker import SpellChecker
 from langdetect import detect
 import psutil
 
+from page_parser import parse_html, walk_page
+from report_builder import (
+    overall_percent, percent, report_metrics, report_status, score_card, technical_tabs
+)
+
 # Load environment variables
 load_dotenv()
 
-# Download required NLTK data
+# NLTK data is installed ahead of time (see scripts/bootstrap_nltk.py);
+# NLTK_DATA points at a custom data directory when one is used
+NLTK_DATA_DIR = os.environ.get('NLTK_DATA')
+if NLTK_DATA_DIR and NLTK_DATA_DIR not in nltk.data.path:
+    nltk.data.path.insert(0, NLTK_DATA_DIR)
+
+# Report templates are compiled on first use and cached by the environment;
+# the files never change under a running process, so skip the per-render mtime
+# check, and strip block-tag whitespace from the output
+REPORT_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+# Archive written by scripts/compile_templates.py; used only while it is newer
+# than every template source, so an edited template is never shadowed
+COMPILED_TEMPLATES = os.path.join(REPORT_TEMPLATE_DIR, 'compiled_templates.zip')
+
+def _report_template_loader():
+    """Precompiled template loader when the archive is current, else the source loader"""
+    try:
+        compiled_at = os.path.getmtime(COMPILED_TEMPLATES)
+        sources = [entry for entry in os.scandir(REPORT_TEMPLATE_DIR) if entry.name.endswith('.jinja')]
+        if all(entry.stat().st_mtime <= compiled_at for entry in sources):
+            return ModuleLoader(COMPILED_TEMPLATES)
+    except OSError:
+        pass
+    return FileSystemLoader(REPORT_TEMPLATE_DIR)
+
+REPORT_TEMPLATES = Environment(
+    loader=_report_template_loader(),
+    autoescape=True,
+    auto_reload=False,
+    trim_blocks=True,
+    lstrip_blocks=True
+)
+
+def _read_report_asset(name: str) -> Markup:
+    """Contents of a static report asset in the templates directory"""
+    with open(os.path.join(REPORT_TEMPLATE_DIR, name), encoding='utf-8') as f:
+        return Markup(f.read())
+
+# The report stylesheet and script are static, so they are read once and
+# inlined into each report from these constants
+REPORT_CSS = _read_report_asset('advanced_report.css')
+REPORT_JS = _read_report_asset('advanced_report.js')
+
+# Rendered template fragments are grouped this many at a time before each
+# write, and report files get a buffer large enough to hold several groups
+REPORT_STREAM_CHUNK = 64
+REPORT_FILE_BUFFER = 1 << 16
+
+# Reports whose AI recommendations are shorter than this are rendered in one
+# call and written once; the stream's chunk bookkeeping only pays off for
+# large reports
+REPORT_STREAM_THRESHOLD = 16384
+
+# OpenAI model behind the AI recommendations, named in the report footer
+AI_MODEL = os.environ.get('OPENAI_MODEL', 'gpt-4o-mini')
+
+# Default heading and footer; wrappers such as the ultimate analyzer pass their own
+REPORT_HEADING = '🔍 Advanced SEO Analysis Report'
+REPORT_FOOTER = f'Advanced SEO Analysis Report • Powered by OpenAI {AI_MODEL}'
+
+class _TeeWriter:
+    """Text sink that forwards every write to several open files"""
+    def __init__(self, *files: IO[str]):
+        self.files = files
+
+    def write(self, text: str):
+        for f in self.files:
+            f.write(text)
+
+# Upper bound on simultaneous requests to any single host
+MAX_REQUESTS_PER_HOST = 8
+
+HEADING_TAGS = frozenset(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+
+# Stop reading page bodies past this size; the remainder is not parsed
+MAX_PAGE_BYTES = 5 * 1024 * 1024
+
+# <meta name="..."> values that map straight onto a data field
+META_NAME_FIELDS = {
+    'description': 'meta_description',
+    'keywords': 'meta_keywords',
+    'robots': 'robots_meta',
+    'viewport': 'viewport'
+}
+
+SECURITY_HEADERS = frozenset([
+    'strict-transport-security', 'content-security-policy', 'x-frame-options',
+    'x-content-type-options', 'x-xss-protection', 'referrer-policy'
+])
+
+# Extension at the end of a URL path, ignoring any query string or fragment
+FILE_EXT_RE = re.compile(r'\.([a-z0-9]{1,5})(?:$|[?#])', re.I)
+
+CDN_SERVER_RE = re.compile(r'cloudflare|cloudfront|fastly|maxcdn|keycdn')
+
+CACHEABLE_RE = re.compile(r'max-age|public')
+
+VIDEO_PLATFORM_RE = re.compile(r'youtube|vimeo|dailymotion')
+VIDEO_PLATFORMS = {'youtube': 'YouTube', 'vimeo': 'Vimeo', 'dailymotion': 'Dailymotion'}
+
+# Sentence boundary: terminal punctuation followed by whitespace and a capital
+SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+(?=[A-Z])')
+
+# NLP tools are built on first use and shared by every analyzer in the process
+_nlp_tools = {}
+_nlp_tools_lock = threading.Lock()
+
+def _nlp_tool(name: str, factory):
+    """Build an NLP tool once per process, or None if its data is unavailable"""
+    with _nlp_tools_lock:
+        if name not in _nlp_tools:
+            try:
+                _nlp_tools[name] = factory()
+            except:
+                print(f"⚠️ Warning: {name} unavailable, related analysis will be skipped")
+                _nlp_tools[name] = None
+        return _nlp_tools[name]
+
+def _with_nltk_data(resource: str, factory):
+    """Wrap factory so a missing NLTK resource is downloaded once, then retried"""
+    def build():
+        try:
+            return factory()
+        except LookupError:
+            nltk.download(resource, quiet=True, download_dir=NLTK_DATA_DIR)
+            return factory()
+    return build
+
+def _sia() -> Optional[SentimentIntensityAnalyzer]:
+    return _nlp_tool('Sentiment analyzer', _with_nltk_data('vader_lexicon', SentimentIntensityAnalyzer))
+
+def _word_tokenizer():
+    def load():
+        word_tokenize('')  # loads the Punkt model, raising LookupError when it is missing
+        return word_tokenize
+    return _nlp_tool('Word tokenizer', _with_nltk_data('punkt_tab', load))
+
+def _known_words() -> Optional[frozenset]:
+    return _nlp_tool('English word list', lambda: frozenset(SpellChecker().word_frequency.dictionary))
+
+def _stop() -> frozenset:
+    return _nlp_tool('Stopwords', _with_nltk_data('stopwords', lambda: frozenset(stopwords.words('english')))) or frozenset()
+
+def _word_lengths(texts: List[str]) -> np.ndarray:
+    """Word count of each text as an int32 array"""
+    return np.fromiter((len(text.split()) for text in texts), dtype=np.int32, count=len(texts))
+
+# Both helpers see the same asset URLs over and over across pages of a site
+@lru_cache(maxsize=8192)
+def _get_file_extension(url: str) -> str:
+    """Get file extension from URL"""
+    match = FILE_EXT_RE.search(url)
+    return match.group(1).lower() if match else ''
+
+@lru_cache(maxsize=8192)
+def _detect_video_platform(url: str) -> str:
+    """Detect video platform from URL"""
+    match = VIDEO_PLATFORM_RE.search(url)
+    return VIDEO_PLATFORMS[match.group()] if match else 'Unknown'
+
+# Performance score ladders: a value <= thresholds[i] takes outcomes[i], and
+# anything above the last threshold takes the final outcome. Each outcome is
+# (points, analysis list to report in or None, message formatted with value)
+RESPONSE_TIME_THRESHOLDS = (0.5, 1.0, 2.0)
+RESPONSE_TIME_OUTCOMES = (
+    (25, 'good_practices', 'Excellent response time'),
+    (20, 'good_practices', 'Good response time'),
+    (10, 'warnings', 'Response time could be improved'),
+    (0, 'issues', 'Poor response time - needs optimization')
+)
+PAGE_SIZE_MB_THRESHOLDS = (0.5, 1.0, 2.0)
+PAGE_SIZE_OUTCOMES = (
+    (20, 'good_practices', 'Optimal page size'),
+    (15, None, None),
+    (10, 'warnings', 'Page size could be optimized'),
+    (0, 'issues', 'Large page size - consider optimization')
+)
+CSS_COUNT_THRESHOLDS = (3, 6)
+CSS_COUNT_OUTCOMES = (
+    (10, None, None),
+    (5, None, None),
+    (0, 'warnings', 'Many CSS files ({value}) - consider combining')
+)
+JS_COUNT_THRESHOLDS = (5, 10)
+JS_COUNT_OUTCOMES = (
+    (10, None, None),
+    (5, None, None),
+    (0, 'warnings', 'Many JavaScript files ({value}) - consider combining')
+)
+
+def _apply_score_ladder(analysis: Dict[str, Any], value: float, thresholds: tuple, outcomes: tuple):
+    """Add the points and message of the bucket value falls into"""
+    points, section, message = outcomes[bisect_left(thresholds, value)]
+    analysis['score'] += points
+    if section:
+        analysis[section].append(message.format(value=value))
+
+# Shared resolver whose cache honours each answer's TTL
 try:
-    nltk.download('vader_lexicon', quiet=True)
-    nltk.download('punkt', quiet=True)
-    nltk.download('stopwords', quiet=True)
-    nltk.download('averaged_perceptron_tagger', quiet=True)
-except:
-    pass
+    _dns_resolver = dns.resolver.Resolver()
+except dns.resolver.NoResolverConfiguration:
+    _dns_resolver = dns.resolver.Resolver(configure=False)
+_dns_resolver.cache = dns.resolver.LRUCache(max_size=1024)
+_dns_resolver.lifetime = 5.0
+
+# Complete domain analyses are reused for an hour, so repeated domains in a
+# multi-page run skip the SSL and WHOIS round-trips too
+DOMAIN_CACHE_TTL = 3600
+_domain_analysis_cache = {}
+_domain_analysis_cache_lock = threading.Lock()
+
+# AI recommendations are content-addressed: the key hashes the model and the
+# page content the analyses are derived from, minus fields that change on
+# every fetch, so re-analysing an unchanged page reuses the answer for a day,
+# in memory and on disk across runs
+AI_CACHE_TTL = 86400
+AI_CACHE_DIR = os.path.expanduser(os.environ.get('SEO_ANALYZER_CACHE_DIR', os.path.join('~', '.cache', 'seo_analyzer')))
+# Timing, headers and link probe results differ between fetches of the same
+# page; the analysis messages built from them (such as the slow response
+# warning) are left out of the key along with them
+AI_CACHE_VOLATILE_FIELDS = frozenset({'response_time', 'fetch_timestamp', 'headers', 'broken_links'})
+_ai_recommendation_cache = {}
+_ai_recommendation_cache_lock = threading.Lock()
+# Expired entries are swept at most once per TTL window, on a store, so a
+# write does not cost a scan of the whole cache directory
+_ai_cache_pruned_at = 0.0
+
+def _ai_cache_key(data: Dict[str, Any]) -> str:
+    """SHA-256 of the model and the stable page content behind the AI prompt"""
+    canonical = {
+        'model': AI_MODEL,
+        'data': {k: v for k, v in data.items() if k not in AI_CACHE_VOLATILE_FIELDS and not k.startswith('_')}
+    }
+    return hashlib.sha256(orjson.dumps(canonical, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)).hexdigest()
+
+def _cached_ai_recommendations(key: str) -> Optional[str]:
+    """Unexpired recommendations for key from memory, then from the disk cache"""
+    with _ai_recommendation_cache_lock:
+        cached = _ai_recommendation_cache.get(key)
+    if cached and time.time() - cached[0] < AI_CACHE_TTL:
+        return cached[1]
+    
+    path = os.path.join(AI_CACHE_DIR, f'{key}.md')
+    try:
+        saved_at = os.path.getmtime(path)
+        if time.time() - saved_at < AI_CACHE_TTL:
+            with open(path, encoding='utf-8') as f:
+                recommendations = f.read()
+            with _ai_recommendation_cache_lock:
+                _ai_recommendation_cache[key] = (saved_at, recommendations)
+            return recommendations
+    except OSError:
+        pass
+    return None
+
+def _store_ai_recommendations(key: str, recommendations: str):
+    """Remember recommendations in memory and, best effort, on disk, periodically dropping expired entries from both"""
+    global _ai_cache_pruned_at
+    now = time.time()
+    with _ai_recommendation_cache_lock:
+        prune = now - _ai_cache_pruned_at >= AI_CACHE_TTL
+        if prune:
+            _ai_cache_pruned_at = now
+            for expired in [k for k, (saved_at, _) in _ai_recommendation_cache.items() if now - saved_at >= AI_CACHE_TTL]:
+                del _ai_recommendation_cache[expired]
+        _ai_recommendation_cache[key] = (now, recommendations)
+    
+    path = os.path.join(AI_CACHE_DIR, f'{key}.md')
+    try:
+        os.makedirs(AI_CACHE_DIR, exist_ok=True)
+        if prune:
+            for entry in os.scandir(AI_CACHE_DIR):
+                if entry.name.endswith('.md') and entry.is_file():
+                    try:
+                        if now - entry.stat().st_mtime >= AI_CACHE_TTL:
+                            os.remove(entry.path)
+                    except OSError:
+                        pass  # Already removed by another writer
+        # Write then rename so a concurrent reader never sees a partial file
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(recommendations)
+        os.replace(temp_path, path)
+    except OSError as e:
+        print(f"⚠️ Warning: Could not cache AI recommendations: {str(e)}")
+
+# Long-lived pool for the domain probes, started on first use so importers
+# that never analyse a domain do not get one; a hung WHOIS or TLS probe can be
+# abandoned after DOMAIN_PROBE_TIMEOUT without blocking the analysis
+DOMAIN_PROBE_TIMEOUT = 15
+_domain_probe_pool = None
+_domain_probe_pool_lock = threading.Lock()
+
+def _domain_probes() -> ThreadPoolExecutor:
+    """The shared domain probe pool, built once per process"""
+    global _domain_probe_pool
+    with _domain_probe_pool_lock:
+        if _domain_probe_pool is None:
+            _domain_probe_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix='domain-probe')
+        return _domain_probe_pool
+
+def _resolve_records(domain: str, record_type: str) -> Tuple[str, ...]:
+    """Resolve one DNS record type for a domain"""
+    return tuple(record.to_text() for record in _dns_resolver.resolve(domain, record_type))
+
+# One verified TLS context for every certificate probe (contexts are thread-safe),
+# plus the last session of the most recently probed domains so repeat probes
+# can resume instead of doing a full handshake; the least recently used
+# domain is dropped once SSL_SESSION_CACHE_SIZE are held
+SSL_SESSION_CACHE_SIZE = 256
+_ssl_context = ssl.create_default_context()
+_ssl_sessions = OrderedDict()
+_ssl_sessions_lock = threading.Lock()
+
+# Each certificate name RDN is a tuple of (field, value) pairs; keep the first
+_first_pair = itemgetter(0)
+
+def _ssl_certificate(domain: str) -> Dict[str, Any]:
+    """Fetch the TLS certificate details a domain serves on port 443"""
+    with _ssl_sessions_lock:
+        session = _ssl_sessions.get(domain)
+    with socket.create_connection((domain, 443), timeout=10) as sock:
+        with _ssl_context.wrap_socket(sock, server_hostname=domain, session=session) as ssock:
+            with _ssl_sessions_lock:
+                _ssl_sessions[domain] = ssock.session
+                _ssl_sessions.move_to_end(domain)
+                if len(_ssl_sessions) > SSL_SESSION_CACHE_SIZE:
+                    _ssl_sessions.popitem(last=False)
+            cert = ssock.getpeercert()
+            return {
+                'subject': dict(map(_first_pair, cert['subject'])),
+                'issuer': dict(map(_first_pair, cert['issuer'])),
+                'version': cert['version'],
+                'serial_number': cert['serialNumber'],
+                'not_before': cert['notBefore'],
+                'not_after': cert['notAfter'],
+                'san': cert.get('subjectAltName', ())
+            }
+
+def _whois_record(domain: str) -> Dict[str, Any]:
+    """Look up the WHOIS registration details for a domain"""
+    w = whois.whois(domain)
+    if not w:
+        return {}
+    return {
+        'domain_name': w.domain_name,
+        'registrar': w.registrar,
+        'creation_date': str(w.creation_date) if w.creation_date else None,
+        'expiration_date': str(w.expiration_date) if w.expiration_date else None,
+        'name_servers': w.name_servers if w.name_servers else [],
+        'status': w.status if w.status else []
+    }
+
+def parse_page(url: str, body: bytes, response_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract page data from a downloaded body; pure, so it can run in a worker process"""
+    headers = CaseInsensitiveDict(response_info['headers'])
+    tree = parse_html(body)
+    parsed_url = urlparse(url)
+    
+    # Extract comprehensive data
+    data = {
+        'url': url,
+        'domain': parsed_url.netloc,
+        'status_code': response_info['status_code'],
+        'content_length': response_info['page_size'],
+        'response_time': response_info['response_time'],
+        'headers': dict(headers),
+        'encoding': response_info['encoding'],
+        'final_url': response_info['final_url'],
+        'redirects': response_info['redirects'],
+        
+        # Basic SEO elements
+        'title': '',
+        'meta_description': '',
+        'meta_keywords': '',
+        'canonical_url': '',
+        'robots_meta': '',
+        'viewport': '',
+        'charset': '',
+        
+        # Content analysis
+        'h1_tags': [],
+        'h2_tags': [],
+        'h3_tags': [],
+        'h4_tags': [],
+        'h5_tags': [],
+        'h6_tags': [],
+        
+        # Images and media
+        'images': [],
+        'videos': [],
+        'audio': [],
+        
+        # Links
+        'internal_links': [],
+        'external_links': [],
+        'broken_links': [],
+        
+        # Technical elements
+        'meta_tags': {},
+        'structured_data': [],
+        'css_files': [],
+        'js_files': [],
+        'forms': [],
+        
+        # Content
+        'content': '',
+        'html_content_length': len(body),
+        'word_count': 0,
+        'sentences': [],
+        'paragraphs': [],
+        
+        # Performance data
+        'page_size': response_info['page_size'],
+        'compression': headers.get('content-encoding', ''),
+        'cache_control': headers.get('cache-control', ''),
+        'server': headers.get('server', ''),
+        
+        # Security
+        'https': url.startswith('https'),
+        'security_headers': {},
+        
+        # Social media
+        'og_tags': {},
+        'twitter_tags': {},
+        
+        # Language and accessibility
+        'lang': '',
+        'alt_texts': [],
+        'aria_labels': [],
+        
+        # Additional metadata
+        'fetch_timestamp': datetime.now().isoformat(),
+        'analysis_version': '2.0'
+    }
+    
+    # Walk the lxml tree once and dispatch on tag name instead of
+    # re-scanning the whole document per element type; the visible text is
+    # gathered on the same walk
+    title_found = canonical_found = charset_found = lang_found = False
+    
+    # Links are resolved against these without a full URL parse where possible
+    base_url = f"{parsed_url.scheme}://{data['domain']}"
+    resolved_links = {}
+    texts = []
+    for event, element, text in walk_page(tree):
+        if text:
+            texts.append(text)
+        if event != 'start':
+            continue
+        tag = element.tag
+        
+        attrs = element.attrib
+        
+        if 'aria-label' in attrs:
+            data['aria_labels'].append(attrs['aria-label'])
+        
+        if tag in HEADING_TAGS:
+            data[f'{tag}_tags'].append(element.text_content().strip())
+        
+        elif tag == 'p':
+            paragraph = element.text_content().strip()
+            if paragraph:
+                data['paragraphs'].append(paragraph)
+        
+        elif tag == 'a':
+            href = element.get('href')
+            if href is None or href.startswith(('#', 'mailto:')):
+                continue
+            
+            resolved = resolved_links.get(href)
+            if resolved is None:
+                if href.startswith('/') and not href.startswith('//'):
+                    resolved = (base_url + href, data['domain'])
+                elif href.startswith(base_url) and href[len(base_url):len(base_url) + 1] in ('', '/', '?', '#'):
+                    resolved = (href, data['domain'])
+                else:
+                    absolute_url = urljoin(url, href)
+                    resolved = (absolute_url, urlparse(absolute_url).netloc)
+                resolved_links[href] = resolved
+            link_url, link_domain = resolved
+            link_text = element.text_content().strip()
+            rel = element.get('rel', '').split()
+            
+            link_data = {
+                'url': link_url,
+                'text': link_text,
+                'title': element.get('title', ''),
+                'rel': rel,
+                'target': element.get('target', ''),
+                'is_internal': link_domain == data['domain'] or not link_domain,
+                'is_external': link_domain != data['domain'] and bool(link_domain),
+                'is_nofollow': 'nofollow' in rel,
+                'is_sponsored': 'sponsored' in rel,
+                'anchor_text_length': len(link_text)
+            }
+            
+            if link_data['is_internal']:
+                data['internal_links'].append(link_data)
+            elif link_data['is_external']:
+                data['external_links'].append(link_data)
+        
+        elif tag == 'img':
+            img_data = {
+                'src': element.get('src', ''),
+                'alt': element.get('alt', ''),
+                'title': element.get('title', ''),
+                'width': element.get('width', ''),
+                'height': element.get('height', ''),
+                'loading': element.get('loading', ''),
+                'srcset': element.get('srcset', ''),
+                'sizes': element.get('sizes', ''),
+                'has_alt': bool(element.get('alt')),
+                'is_decorative': element.get('alt') == '',
+                'file_extension': _get_file_extension(element.get('src', ''))
+            }
+            data['images'].append(img_data)
+            if img_data['alt']:
+                data['alt_texts'].append(img_data['alt'])
+        
+        elif tag == 'meta':
+            if not charset_found and 'charset' in attrs:
+                data['charset'] = element.get('charset', '')
+                charset_found = True
+            
+            name = element.get('name', '').lower()
+            property_attr = element.get('property', '').lower()
+            content = element.get('content', '')
+            
+            field = META_NAME_FIELDS.get(name)
+            if field:
+                data[field] = content
+            elif property_attr.startswith('og:'):
+                data['og_tags'][property_attr] = content
+            elif name.startswith('twitter:'):
+                data['twitter_tags'][name] = content
+            elif name or property_attr:
+                data['meta_tags'][name or property_attr] = content
+        
+        elif tag == 'link':
+            rel = element.get('rel', '').lower().split()
+            if 'canonical' in rel and not canonical_found:
+                data['canonical_url'] = element.get('href', '')
+                canonical_found = True
+            if 'stylesheet' in rel:
+                data['css_files'].append({
+                    'href': element.get('href', ''),
+                    'media': element.get('media', ''),
+                    'type': element.get('type', '')
+                })
+        
+        elif tag == 'script':
+            if 'src' in attrs:
+                data['js_files'].append({
+                    'src': element.get('src', ''),
+                    'type': element.get('type', ''),
+                    'async': 'async' in attrs,
+                    'defer': 'defer' in attrs
+                })
+            if element.get('type') == 'application/ld+json':
+                try:
+                    structured = json.loads(element.text)
+                    data['structured_data'].append(structured)
+                except:
+                    pass
+        
+        elif tag == 'video':
+            data['videos'].append({
+                'src': element.get('src', ''),
+                'controls': 'controls' in attrs,
+                'autoplay': 'autoplay' in attrs,
+                'muted': 'muted' in attrs,
+                'loop': 'loop' in attrs
+            })
+        
+        elif tag == 'iframe':
+            src = element.get('src', '')
+            if VIDEO_PLATFORM_RE.search(src):
+                data['videos'].append({
+                    'src': src,
+                    'platform': _detect_video_platform(src),
+                    'embedded': True
+                })
+        
+        elif tag == 'form':
+            data['forms'].append({
+                'action': element.get('action', ''),
+                'method': element.get('method', 'get').lower(),
+                'inputs': len(element.findall('.//input')),
+                'has_labels': element.find('.//label') is not None,
+                'has_fieldsets': element.find('.//fieldset') is not None
+            })
+        
+        elif tag == 'title':
+            if not title_found:
+                data['title'] = element.text_content().strip()
+                title_found = True
+        
+        elif tag == 'html':
+            if not lang_found and 'lang' in attrs:
+                data['lang'] = element.get('lang', '')
+                lang_found = True
+    
+    # Process content once; the content analysis reuses these derived values
+    # instead of re-splitting and re-lowercasing. Text nodes are joined as they
+    # stand, as get_text() did, so a word split across inline tags stays one
+    # word and the counts match the bulk and competitor analyzers
+    content_text = ''.join(texts)
+    data['content'] = content_text
+    data['_content_lower'] = content_text.lower()
+    data['word_count'] = len(content_text.split())
+    data['sentences'] = SENTENCE_SPLIT_RE.split(content_text) if content_text else []
+    
+    # Extract security headers
+    for header, value in headers.items():
+        header = header.lower()
+        if header in SECURITY_HEADERS:
+            data['security_headers'][header] = value
+    
+    return data
+
+# Static recommendations used whenever the OpenAI call is unavailable
+FALLBACK_RECOMMENDATIONS = """
+        # COMPREHENSIVE SEO RECOMMENDATIONS
+
+        ## 🚨 CRITICAL FIXES (High Priority)
+        - Fix all critical technical issues identified in the analysis
+        - Ensure HTTPS is properly implemented
+        - Optimize page loading speed to under 2 seconds
+        - Fix missing or poorly optimized meta tags
+
+        ## 🔍 SEO OPTIMIZATION (Traditional Search)
+        - Optimize title tags (50-60 characters with primary keywords)
+        - Write compelling meta descriptions (150-160 characters)
+        - Implement proper heading hierarchy (H1, H2, H3)
+        - Add alt text to all images
+        - Improve internal linking structure
+        - Create XML sitemap and submit to search engines
+
+        ## 🎯 AEO OPTIMIZATION (Answer Engine Optimization)
+        - Structure content for featured snippets
+        - Add comprehensive FAQ sections
+        - Optimize for voice search with conversational keywords
+        - Implement structured data markup (Schema.org)
+        - Create "People Also Ask" style content
+        - Optimize for local search if applicable
+
+        ## 🤖 GEO OPTIMIZATION (Generative Engine Optimization)
+        - Create authoritative, well-sourced content
+        - Use clear entity definitions and relationships
+        - Implement comprehensive topic coverage
+        - Add factual accuracy and citations
+        - Structure content for AI understanding
+        - Build topical authority through content clusters
+
+        ## ⚡ PERFORMANCE IMPROVEMENTS
+        - Optimize images (WebP format, proper sizing)
+        - Minify CSS and JavaScript files
+        - Enable compression (gzip/brotli)
+        - Implement browser caching
+        - Use a Content Delivery Network (CDN)
+        - Optimize Core Web Vitals (LCP, FID, CLS)
+
+        ## ♿ ACCESSIBILITY ENHANCEMENTS
+        - Add alt text to all images
+        - Ensure proper color contrast ratios
+        - Implement keyboard navigation
+        - Add ARIA labels where needed
+        - Use semantic HTML elements
+        - Test with screen readers
+
+        ## 🔒 SECURITY HARDENING
+        - Implement security headers (HSTS, CSP, X-Frame-Options)
+        - Keep software and plugins updated
+        - Use strong SSL/TLS configuration
+        - Implement proper authentication
+        - Regular security audits
+        - Backup strategy
+
+        ## 📝 CONTENT STRATEGY
+        - Increase content depth and quality
+        - Target long-tail keywords
+        - Create pillar pages and topic clusters
+        - Regular content updates and freshness
+        - User-generated content integration
+        - Multi-media content (videos, infographics)
+
+        ## 🔧 TECHNICAL IMPROVEMENTS
+        - Implement proper redirects (301 for permanent)
+        - Fix broken links and 404 errors
+        - Optimize URL structure
+        - Implement breadcrumb navigation
+        - Mobile-first responsive design
+        - Progressive Web App features
+
+        ## 📊 MONITORING & MAINTENANCE
+        - Set up Google Search Console and Analytics
+        - Regular SEO audits and monitoring
+        - Track keyword rankings and traffic
+        - Monitor Core Web Vitals
+        - Competitor analysis
+        - Regular content audits and updates
+        """
 
 class AdvancedSEOAnalyzer:
     def __init__(self):
@@ -67,267 +781,184 @@ class AdvancedSEOAnalyzer:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
         
-        # Initialize NLP tools
-        try:
-            self.sentiment_analyzer = SentimentIntensityAnalyzer()
-            self.spell_checker = SpellChecker()
-            self.stop_words = set(stopwords.words('english'))
-        except:
-            print("⚠️ Warning: Some NLP features may not work properly")
-            self.sentiment_analyzer = None
-            self.spell_checker = None
-            self.stop_words = set()
+        # Keep connections alive and pooled across every request this analyzer makes
+        adapter = HTTPAdapter(
+            pool_connections=64,
+            pool_maxsize=64,
+            max_retries=Retry(total=2, backoff_factor=0.3)
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Per-host semaphores so parallel fetches never hammer one origin
+        self._host_slots = {}
+        self._host_slots_lock = threading.Lock()
 
-    def fetch_comprehensive_website_data(self, url: str) -> Dict[str, Any]:
-        """Fetch comprehensive website data with advanced analysis"""
+    def close(self):
+        """Release the pooled HTTP and OpenAI connections"""
+        self.session.close()
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _fetch_page(self, url: str) -> Optional[Tuple[bytes, Dict[str, Any]]]:
+        """Download a page body along with the response details parse_page needs"""
         try:
             print(f"🔍 Fetching comprehensive website data from: {url}")
             
-            # Start timing
-            start_time = time.time()
-            
-            # Get basic response
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            
-            fetch_time = time.time() - start_time
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+            with self._host_slot(url):
+                # Start timing
+                start_time = time.time()
+                
+                # Get basic response, streaming so oversized or non-HTML bodies are never fully downloaded
+                response = self.session.get(url, timeout=15, stream=True)
+                try:
+                    response.raise_for_status()
+                    
+                    content_type = response.headers.get('content-type', '').lower()
+                    if content_type and 'html' not in content_type:
+                        print(f"❌ Skipping non-HTML content ({content_type}): {url}")
+                        return None
+                    
+                    body = bytearray()
+                    for chunk in response.iter_content(65536):
+                        body += chunk
+                        if len(body) > MAX_PAGE_BYTES:
+                            print(f"⚠️ Page larger than {MAX_PAGE_BYTES // (1024 * 1024)}MB, analyzing the first part only")
+                            break
+                    
+                    # The size is the decoded bytes read; Content-Length would give
+                    # the compressed size of a gzip or br response
+                    page_size = len(body)
+                    body = bytes(body[:MAX_PAGE_BYTES])
+                finally:
+                    response.close()
+                
+                fetch_time = time.time() - start_time
             
-            # Extract comprehensive data
-            data = {
-                'url': url,
-                'domain': urlparse(url).netloc,
+            response_info = {
                 'status_code': response.status_code,
-                'content_length': len(response.content),
                 'response_time': fetch_time,
                 'headers': dict(response.headers),
                 'encoding': response.encoding,
                 'final_url': response.url,
                 'redirects': len(response.history),
-                
-                # Basic SEO elements
-                'title': soup.find('title').get_text().strip() if soup.find('title') else '',
-                'meta_description': '',
-                'meta_keywords': '',
-                'canonical_url': '',
-                'robots_meta': '',
-                'viewport': '',
-                'charset': '',
-                
-                # Content analysis
-                'h1_tags': [h1.get_text().strip() for h1 in soup.find_all('h1')],
-                'h2_tags': [h2.get_text().strip() for h2 in soup.find_all('h2')],
-                'h3_tags': [h3.get_text().strip() for h3 in soup.find_all('h3')],
-                'h4_tags': [h4.get_text().strip() for h4 in soup.find_all('h4')],
-                'h5_tags': [h5.get_text().strip() for h5 in soup.find_all('h5')],
-                'h6_tags': [h6.get_text().strip() for h6 in soup.find_all('h6')],
-                
-                # Images and media
-                'images': [],
-                'videos': [],
-                'audio': [],
-                
-                # Links
-                'internal_links': [],
-                'external_links': [],
-                'broken_links': [],
-                
-                # Technical elements
-                'meta_tags': {},
-                'structured_data': [],
-                'css_files': [],
-                'js_files': [],
-                'forms': [],
-                
-                # Content
-                'content': soup.get_text(),
-                'html_content': str(soup),
-                'word_count': 0,
-                'sentences': [],
-                'paragraphs': [],
-                
-                # Performance data
-                'page_size': len(response.content),
-                'compression': response.headers.get('content-encoding', ''),
-                'cache_control': response.headers.get('cache-control', ''),
-                'server': response.headers.get('server', ''),
-                
-                # Security
-                'https': url.startswith('https'),
-                'security_headers': {},
-                
-                # Social media
-                'og_tags': {},
-                'twitter_tags': {},
-                
-                # Language and accessibility
-                'lang': soup.find('html', lang=True).get('lang', '') if soup.find('html', lang=True) else '',
-                'alt_texts': [],
-                'aria_labels': [],
-                
-                # Additional metadata
-                'fetch_timestamp': datetime.now().isoformat(),
-                'analysis_version': '2.0'
+                'page_size': page_size
             }
-            
-            # Extract meta tags
-            for meta in soup.find_all('meta'):
-                name = meta.get('name', '').lower()
-                property_attr = meta.get('property', '').lower()
-                content = meta.get('content', '')
-                
-                if name == 'description':
-                    data['meta_description'] = content
-                elif name == 'keywords':
-                    data['meta_keywords'] = content
-                elif name == 'robots':
-                    data['robots_meta'] = content
-                elif name == 'viewport':
-                    data['viewport'] = content
-                elif property_attr.startswith('og:'):
-                    data['og_tags'][property_attr] = content
-                elif name.startswith('twitter:'):
-                    data['twitter_tags'][name] = content
-                elif name or property_attr:
-                    data['meta_tags'][name or property_attr] = content
-            
-            # Extract canonical URL
-            canonical = soup.find('link', rel='canonical')
-            if canonical:
-                data['canonical_url'] = canonical.get('href', '')
-            
-            # Extract charset
-            charset_meta = soup.find('meta', charset=True)
-            if charset_meta:
-                data['charset'] = charset_meta.get('charset', '')
-            
-            # Extract images with detailed analysis
-            for img in soup.find_all('img'):
-                img_data = {
-                    'src': img.get('src', ''),
-                    'alt': img.get('alt', ''),
-                    'title': img.get('title', ''),
-                    'width': img.get('width', ''),
-                    'height': img.get('height', ''),
-                    'loading': img.get('loading', ''),
-                    'srcset': img.get('srcset', ''),
-                    'sizes': img.get('sizes', ''),
-                    'has_alt': bool(img.get('alt')),
-                    'is_decorative': img.get('alt') == '',
-                    'file_extension': self._get_file_extension(img.get('src', ''))
-                }
-                data['images'].append(img_data)
-                if img_data['alt']:
-                    data['alt_texts'].append(img_data['alt'])
-            
-            # Extract videos
-            for video in soup.find_all(['video', 'iframe']):
-                if video.name == 'video':
-                    video_data = {
-                        'src': video.get('src', ''),
-                        'controls': video.has_attr('controls'),
-                        'autoplay': video.has_attr('autoplay'),
-                        'muted': video.has_attr('muted'),
-                        'loop': video.has_attr('loop')
-                    }
-                else:  # iframe
-                    src = video.get('src', '')
-                    if any(platform in src for platform in ['youtube', 'vimeo', 'dailymotion']):
-                        video_data = {
-                            'src': src,
-                            'platform': self._detect_video_platform(src),
-                            'embedded': True
-                        }
-                    else:
-                        continue
-                data['videos'].append(video_data)
-            
-            # Extract links with analysis
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                link_url = urljoin(url, href)
-                link_domain = urlparse(link_url).netloc
-                
-                link_data = {
-                    'url': link_url,
-                    'text': link.get_text().strip(),
-                    'title': link.get('title', ''),
-                    'rel': link.get('rel', []),
-                    'target': link.get('target', ''),
-                    'is_internal': link_domain == data['domain'] or not link_domain,
-                    'is_external': link_domain != data['domain'] and bool(link_domain),
-                    'is_nofollow': 'nofollow' in link.get('rel', []),
-                    'is_sponsored': 'sponsored' in link.get('rel', []),
-                    'anchor_text_length': len(link.get_text().strip())
-                }
-                
-                if link_data['is_internal']:
-                    data['internal_links'].append(link_data)
-                elif link_data['is_external']:
-                    data['external_links'].append(link_data)
-            
-            # Extract CSS and JS files
-            for css in soup.find_all('link', rel='stylesheet'):
-                data['css_files'].append({
-                    'href': css.get('href', ''),
-                    'media': css.get('media', ''),
-                    'type': css.get('type', '')
-                })
-            
-            for script in soup.find_all('script', src=True):
-                data['js_files'].append({
-                    'src': script.get('src', ''),
-                    'type': script.get('type', ''),
-                    'async': script.has_attr('async'),
-                    'defer': script.has_attr('defer')
-                })
-            
-            # Extract forms
-            for form in soup.find_all('form'):
-                form_data = {
-                    'action': form.get('action', ''),
-                    'method': form.get('method', 'get').lower(),
-                    'inputs': len(form.find_all('input')),
-                    'has_labels': len(form.find_all('label')) > 0,
-                    'has_fieldsets': len(form.find_all('fieldset')) > 0
-                }
-                data['forms'].append(form_data)
-            
-            # Extract structured data
-            for script in soup.find_all('script', type='application/ld+json'):
-                try:
-                    structured = json.loads(script.string)
-                    data['structured_data'].append(structured)
-                except:
-                    pass
-            
-            # Extract ARIA labels
-            for element in soup.find_all(attrs={'aria-label': True}):
-                data['aria_labels'].append(element.get('aria-label'))
-            
-            # Process content
-            content_text = soup.get_text()
-            data['content'] = content_text
-            data['word_count'] = len(content_text.split())
-            data['sentences'] = sent_tokenize(content_text) if content_text else []
-            data['paragraphs'] = [p.get_text().strip() for p in soup.find_all('p') if p.get_text().strip()]
-            
-            # Extract security headers
-            security_headers = [
-                'strict-transport-security', 'content-security-policy', 'x-frame-options',
-                'x-content-type-options', 'x-xss-protection', 'referrer-policy'
-            ]
-            for header in security_headers:
-                if header in response.headers:
-                    data['security_headers'][header] = response.headers[header]
-            
-            return data
+            return body, response_info
             
         except Exception as e:
             print(f"❌ Error fetching website data: {str(e)}")
             return None
 
+    def fetch_comprehensive_website_data(self, url: str) -> Dict[str, Any]:
+        """Fetch comprehensive website data with advanced analysis"""
+        fetched = self._fetch_page(url)
+        if fetched is None:
+            return None
+        
+        try:
+            return parse_page(url, *fetched)
+        except Exception as e:
+            print(f"❌ Error parsing website data: {str(e)}")
+            return None
+
+    def fetch_many(self, urls: List[str], max_workers: int = 50, parse_processes: int = 0) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Fetch several pages concurrently, keyed by URL in input order
+        
+        With parse_processes > 0 the CPU-bound parsing runs in a process pool
+        while the remaining downloads continue on the fetch threads.
+        """
+        if parse_processes <= 0:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {url: executor.submit(self.fetch_comprehensive_website_data, url) for url in urls}
+                return {url: future.result() for url, future in futures.items()}
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as fetch_pool, \
+                ProcessPoolExecutor(max_workers=parse_processes) as parse_pool:
+            fetch_futures = {fetch_pool.submit(self._fetch_page, url): url for url in urls}
+            parse_futures = {}
+            for future in as_completed(fetch_futures):
+                fetched = future.result()
+                if fetched is not None:
+                    parse_futures[fetch_futures[future]] = parse_pool.submit(parse_page, fetch_futures[future], *fetched)
+            
+            results = {}
+            for url in urls:
+                try:
+                    results[url] = parse_futures[url].result() if url in parse_futures else None
+                except Exception as e:
+                    print(f"❌ Error parsing website data: {str(e)}")
+                    results[url] = None
+            return results
+
+    def check_broken_links(self, data: Dict[str, Any], max_workers: int = 32) -> List[Dict[str, Any]]:
+        """Probe every linked URL with a HEAD request and record the broken ones"""
+        link_urls = {
+            link['url'] for link in data.get('internal_links', []) + data.get('external_links', [])
+            if link['url'].startswith(('http://', 'https://'))
+        }
+        
+        broken_links = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(self._probe_link, link_url): link_url for link_url in link_urls}
+            for future in as_completed(futures):
+                status_code, error = future.result()
+                if error or status_code >= 400:
+                    broken_links.append({
+                        'url': futures[future],
+                        'status_code': status_code,
+                        'error': error
+                    })
+        
+        data['broken_links'] = sorted(broken_links, key=lambda link: link['url'])
+        return data['broken_links']
+
+    def _probe_link(self, url: str):
+        """Return (status_code, error) for a single link"""
+        try:
+            with self._host_slot(url):
+                response = self.session.head(url, timeout=5, allow_redirects=True)
+            return response.status_code, ''
+        except Exception as e:
+            return 0, str(e)
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        """Get the concurrency limiter for a URL's host"""
+        host = urlparse(url).netloc
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(MAX_REQUESTS_PER_HOST)
+        return slot
+
+    def run_analysis_stages(self, data: Dict[str, Any], check_links: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Run the independent analysis stages concurrently
+        
+        The stages only read data, except that with check_links the link
+        probes store data['broken_links'] ahead of the technical analysis, on
+        the same thread; no other stage reads that key.
+        """
+        def technical_stage():
+            # Only the technical analysis reads the link probe results, so the
+            # probes run ahead of it while the other stages proceed
+            if check_links:
+                self.check_broken_links(data)
+            return self.analyze_technical_seo_advanced(data)
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {
+                'technical': executor.submit(technical_stage),
+                'content': executor.submit(self.analyze_content_advanced, data),
+                'performance': executor.submit(self.analyze_performance_metrics, data),
+                'domain': executor.submit(self.analyze_domain_authority, data['domain'])
+            }
+            return {stage: future.result() for stage, future in futures.items()}
+
     def analyze_technical_seo_advanced(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Advanced technical SEO analysis"""
         analysis = {
@@ -392,6 +1023,11 @@ class AdvancedSEOAnalyzer:
         else:
             analysis['categories']['basic_seo']['score'] += 5
         
+        # Broken links (only populated when check_broken_links has run)
+        broken_links = data.get('broken_links', [])
+        if broken_links:
+            analysis['issues'].append(f'{len(broken_links)} broken links found')
+        
         # Performance Analysis
         response_time = data.get('response_time', 0)
         if response_time > 3:
@@ -426,9 +1062,9 @@ class AdvancedSEOAnalyzer:
             analysis['categories']['performance']['score'] += 5
         
         # Accessibility Analysis
-        images_without_alt = [img for img in data.get('images', []) if not img.get('has_alt')]
+        images_without_alt = sum(1 for img in data.get('images', []) if not img.get('has_alt'))
         if images_without_alt:
-            analysis['issues'].append(f'{len(images_without_alt)} images missing alt text')
+            analysis['issues'].append(f'{images_without_alt} images missing alt text')
         else:
             analysis['categories']['accessibility']['score'] += 20
             analysis['good_practices'].append('All images have alt text')
@@ -492,7 +1128,7 @@ class AdvancedSEOAnalyzer:
             'h2_count': len(data.get('h2_tags', [])),
             'h3_count': len(data.get('h3_tags', [])),
             'total_images': len(data.get('images', [])),
-            'images_without_alt': len(images_without_alt),
+            'images_without_alt': images_without_alt,
             'response_time': response_time,
             'page_size_mb': page_size_mb,
             'internal_links': len(data.get('internal_links', [])),
@@ -502,7 +1138,8 @@ class AdvancedSEOAnalyzer:
             'forms': len(data.get('forms', [])),
             'structured_data_items': len(data.get('structured_data', [])),
             'security_headers_count': len(security_headers),
-            'redirects': data.get('redirects', 0)
+            'redirects': data.get('redirects', 0),
+            'broken_links': len(broken_links)
         }
         
         return analysis
@@ -526,7 +1163,8 @@ class AdvancedSEOAnalyzer:
         }
         
         content = data.get('content', '')
-        word_count = len(content.split()) if content else 0
+        content_lower = data.get('_content_lower') or content.lower()
+        word_count = data.get('word_count') or (len(content.split()) if content else 0)
         
         # Content Quality Analysis
         if word_count < 300:
@@ -541,8 +1179,9 @@ class AdvancedSEOAnalyzer:
         
         # Paragraph analysis
         paragraphs = data.get('paragraphs', [])
+        paragraph_lengths = _word_lengths(paragraphs)
+        avg_paragraph_length = float(paragraph_lengths.mean()) if paragraph_lengths.size else 0
         if paragraphs:
-            avg_paragraph_length = sum(len(p.split()) for p in paragraphs) / len(paragraphs)
             if avg_paragraph_length > 100:
                 analysis['warnings'].append('Paragraphs are too long - consider breaking them up')
             else:
@@ -550,8 +1189,10 @@ class AdvancedSEOAnalyzer:
         
         # Sentence analysis
         sentences = data.get('sentences', [])
+        sentence_lengths = _word_lengths(sentences)
+        avg_sentence_length = float(sentence_lengths.mean()) if sentence_lengths.size else 0
+        long_sentences = int((sentence_lengths > 25).sum())
         if sentences:
-            avg_sentence_length = sum(len(s.split()) for s in sentences) / len(sentences)
             if avg_sentence_length > 25:
                 analysis['warnings'].append('Sentences are too long - consider shorter sentences')
             else:
@@ -598,12 +1239,17 @@ class AdvancedSEOAnalyzer:
         title_words = data.get('title', '').lower().split()
         if title_words and content:
             # Find potential main keywords from title
-            main_keywords = [word for word in title_words if len(word) > 3 and word not in self.stop_words]
+            stop_words = _stop()
+            main_keywords = [word for word in title_words if len(word) > 3 and word not in stop_words]
             
             if main_keywords:
+                top_keywords = main_keywords[:3]  # Analyze top 3 keywords
+                
+                # Each keyword is counted on its own over the already lowercased
+                # content, so a keyword inside a longer one is still counted
                 keyword_densities = {}
-                for keyword in main_keywords[:3]:  # Analyze top 3 keywords
-                    keyword_count = content.lower().count(keyword.lower())
+                for keyword in top_keywords:
+                    keyword_count = content_lower.count(keyword)
                     density = (keyword_count / word_count * 100) if word_count > 0 else 0
                     keyword_densities[keyword] = {
                         'count': keyword_count,
@@ -620,9 +1266,10 @@ class AdvancedSEOAnalyzer:
                 analysis['details']['keyword_densities'] = keyword_densities
         
         # Semantic Analysis with NLP
-        if self.sentiment_analyzer and content:
+        sentiment_analyzer = _sia() if content else None
+        if sentiment_analyzer:
             try:
-                sentiment_scores = self.sentiment_analyzer.polarity_scores(content)
+                sentiment_scores = sentiment_analyzer.polarity_scores(content)
                 analysis['details']['sentiment'] = sentiment_scores
                 
                 if sentiment_scores['compound'] >= 0.1:
@@ -637,11 +1284,13 @@ class AdvancedSEOAnalyzer:
                 pass
         
         # Spelling check (sample)
-        if self.spell_checker and content:
+        known_words = _known_words() if content else None
+        tokenize = _word_tokenizer() if known_words else None
+        if tokenize:
             try:
-                words = word_tokenize(content.lower())
+                words = tokenize(content_lower)
                 words = [word for word in words if word.isalpha() and len(word) > 2]
-                misspelled = self.spell_checker.unknown(words[:100])  # Check first 100 words
+                misspelled = set(words[:100]) - known_words  # Check first 100 words
                 
                 if len(misspelled) > 5:
                     analysis['warnings'].append(f'Potential spelling issues detected ({len(misspelled)} words)')
@@ -649,7 +1298,7 @@ class AdvancedSEOAnalyzer:
                     analysis['categories']['semantic_analysis']['score'] += 10
                     analysis['good_practices'].append('No spelling issues detected')
                 
-                analysis['details']['potential_misspellings'] = list(misspelled)[:10]
+                analysis['details']['potential_misspellings'] = sorted(misspelled)[:10]
             except:
                 pass
         
@@ -671,9 +1320,13 @@ class AdvancedSEOAnalyzer:
             'word_count': word_count,
             'sentence_count': len(sentences),
             'paragraph_count': len(paragraphs),
-            'avg_sentence_length': sum(len(s.split()) for s in sentences) / len(sentences) if sentences else 0,
-            'avg_paragraph_length': sum(len(p.split()) for p in paragraphs) / len(paragraphs) if paragraphs else 0,
-            'content_to_code_ratio': len(content) / len(data.get('html_content', '')) if data.get('html_content') else 0
+            'avg_sentence_length': avg_sentence_length,
+            'avg_paragraph_length': avg_paragraph_length,
+            'max_sentence_length': int(sentence_lengths.max()) if sentence_lengths.size else 0,
+            'sentence_length_std': float(sentence_lengths.std()) if sentence_lengths.size else 0,
+            'long_sentences': long_sentences,
+            'max_paragraph_length': int(paragraph_lengths.max()) if paragraph_lengths.size else 0,
+            'content_to_code_ratio': len(content) / data['html_content_length'] if data.get('html_content_length') else 0
         })
         
         return analysis
@@ -691,73 +1344,43 @@ class AdvancedSEOAnalyzer:
             'metrics': {}
         }
         
-        # Response time analysis
+        # Read every field once up front
         response_time = data.get('response_time', 0)
-        if response_time <= 0.5:
-            analysis['score'] += 25
-            analysis['good_practices'].append('Excellent response time')
-        elif response_time <= 1.0:
-            analysis['score'] += 20
-            analysis['good_practices'].append('Good response time')
-        elif response_time <= 2.0:
-            analysis['score'] += 10
-            analysis['warnings'].append('Response time could be improved')
-        else:
-            analysis['issues'].append('Poor response time - needs optimization')
+        page_size = data.get('page_size', 0)
+        css_count = len(data.get('css_files') or ())
+        js_count = len(data.get('js_files') or ())
+        image_count = len(data.get('images') or ())
+        compression = data.get('compression')
+        cache_control = data.get('cache_control', '')
+        server = data.get('server', '').lower()
+        
+        # Response time analysis
+        _apply_score_ladder(analysis, response_time, RESPONSE_TIME_THRESHOLDS, RESPONSE_TIME_OUTCOMES)
         
         # Page size analysis
-        page_size = data.get('page_size', 0)
         page_size_mb = page_size / (1024 * 1024)
-        
-        if page_size_mb <= 0.5:
-            analysis['score'] += 20
-            analysis['good_practices'].append('Optimal page size')
-        elif page_size_mb <= 1.0:
-            analysis['score'] += 15
-        elif page_size_mb <= 2.0:
-            analysis['score'] += 10
-            analysis['warnings'].append('Page size could be optimized')
-        else:
-            analysis['issues'].append('Large page size - consider optimization')
+        _apply_score_ladder(analysis, page_size_mb, PAGE_SIZE_MB_THRESHOLDS, PAGE_SIZE_OUTCOMES)
         
         # Resource analysis
-        css_count = len(data.get('css_files', []))
-        js_count = len(data.get('js_files', []))
-        image_count = len(data.get('images', []))
-        
-        if css_count <= 3:
-            analysis['score'] += 10
-        elif css_count <= 6:
-            analysis['score'] += 5
-        else:
-            analysis['warnings'].append(f'Many CSS files ({css_count}) - consider combining')
-        
-        if js_count <= 5:
-            analysis['score'] += 10
-        elif js_count <= 10:
-            analysis['score'] += 5
-        else:
-            analysis['warnings'].append(f'Many JavaScript files ({js_count}) - consider combining')
+        _apply_score_ladder(analysis, css_count, CSS_COUNT_THRESHOLDS, CSS_COUNT_OUTCOMES)
+        _apply_score_ladder(analysis, js_count, JS_COUNT_THRESHOLDS, JS_COUNT_OUTCOMES)
         
         # Compression check
-        if data.get('compression'):
+        if compression:
             analysis['score'] += 15
             analysis['good_practices'].append('Content compression enabled')
         else:
             analysis['warnings'].append('Enable content compression (gzip/brotli)')
         
         # Caching analysis
-        cache_control = data.get('cache_control', '')
-        if 'max-age' in cache_control or 'public' in cache_control:
+        if CACHEABLE_RE.search(cache_control):
             analysis['score'] += 10
             analysis['good_practices'].append('Caching headers configured')
         else:
             analysis['warnings'].append('Configure caching headers for better performance')
         
         # CDN detection (basic)
-        server = data.get('server', '').lower()
-        cdn_indicators = ['cloudflare', 'cloudfront', 'fastly', 'maxcdn', 'keycdn']
-        if any(cdn in server for cdn in cdn_indicators):
+        if CDN_SERVER_RE.search(server):
             analysis['score'] += 10
             analysis['good_practices'].append('CDN detected')
         
@@ -767,7 +1390,7 @@ class AdvancedSEOAnalyzer:
             'css_files': css_count,
             'js_files': js_count,
             'image_count': image_count,
-            'compression_enabled': bool(data.get('compression')),
+            'compression_enabled': bool(compression),
             'https_enabled': data.get('https', False)
         }
         
@@ -775,6 +1398,11 @@ class AdvancedSEOAnalyzer:
 
     def analyze_domain_authority(self, domain: str) -> Dict[str, Any]:
         """Analyze domain authority and technical details"""
+        with _domain_analysis_cache_lock:
+            cached = _domain_analysis_cache.get(domain)
+        if cached and time.time() - cached[0] < DOMAIN_CACHE_TTL:
+            return copy.deepcopy(cached[1])
+        
         analysis = {
             'domain_info': {},
             'dns_info': {},
@@ -785,70 +1413,72 @@ class AdvancedSEOAnalyzer:
         }
         
         try:
+            # DNS, SSL and WHOIS lookups are independent, so run them side by side
+            probes = _domain_probes()
+            lookups = {
+                'a': probes.submit(_resolve_records, domain, 'A'),
+                'mx': probes.submit(_resolve_records, domain, 'MX'),
+                'ns': probes.submit(_resolve_records, domain, 'NS'),
+                'ssl': probes.submit(_ssl_certificate, domain),
+                'whois': probes.submit(_whois_record, domain)
+            }
+            deadline = time.time() + DOMAIN_PROBE_TIMEOUT
+            remaining = lambda: max(0, deadline - time.time())
+            
             # DNS Analysis
             try:
-                # A record
-                a_records = dns.resolver.resolve(domain, 'A')
-                analysis['dns_info']['a_records'] = [str(record) for record in a_records]
-                
-                # MX records
-                try:
-                    mx_records = dns.resolver.resolve(domain, 'MX')
-                    analysis['dns_info']['mx_records'] = [str(record) for record in mx_records]
-                except:
-                    analysis['dns_info']['mx_records'] = []
+                analysis['dns_info']['a_records'] = list(lookups['a'].result(timeout=remaining()))
                 
-                # NS records
-                try:
-                    ns_records = dns.resolver.resolve(domain, 'NS')
-                    analysis['dns_info']['ns_records'] = [str(record) for record in ns_records]
-                except:
-                    analysis['dns_info']['ns_records'] = []
+                # MX and NS records
+                for record_type in ('mx', 'ns'):
+                    try:
+                        analysis['dns_info'][f'{record_type}_records'] = list(lookups[record_type].result(timeout=remaining()))
+                    except:
+                        analysis['dns_info'][f'{record_type}_records'] = []
                 
             except Exception as e:
-                analysis['issues'].append(f'DNS resolution failed: {str(e)}')
+                analysis['issues'].append(f'DNS resolution failed: {str(e) or "timed out"}')
             
             # SSL Certificate Analysis
             try:
-                context = ssl.create_default_context()
-                with socket.create_connection((domain, 443), timeout=10) as sock:
-                    with context.wrap_socket(sock, server_hostname=domain) as ssock:
-                        cert = ssock.getpeercert()
-                        analysis['ssl_info'] = {
-                            'subject': dict(x[0] for x in cert['subject']),
-                            'issuer': dict(x[0] for x in cert['issuer']),
-                            'version': cert['version'],
-                            'serial_number': cert['serialNumber'],
-                            'not_before': cert['notBefore'],
-                            'not_after': cert['notAfter'],
-                            'san': cert.get('subjectAltName', [])
-                        }
+                analysis['ssl_info'] = dict(lookups['ssl'].result(timeout=remaining()))
             except Exception as e:
-                analysis['issues'].append(f'SSL analysis failed: {str(e)}')
+                analysis['issues'].append(f'SSL analysis failed: {str(e) or "timed out"}')
             
             # WHOIS Information
             try:
-                w = whois.whois(domain)
-                if w:
-                    analysis['whois_info'] = {
-                        'domain_name': w.domain_name,
-                        'registrar': w.registrar,
-                        'creation_date': str(w.creation_date) if w.creation_date else None,
-                        'expiration_date': str(w.expiration_date) if w.expiration_date else None,
-                        'name_servers': w.name_servers if w.name_servers else [],
-                        'status': w.status if w.status else []
-                    }
+                analysis['whois_info'] = dict(lookups['whois'].result(timeout=remaining()))
             except Exception as e:
-                analysis['issues'].append(f'WHOIS lookup failed: {str(e)}')
+                analysis['issues'].append(f'WHOIS lookup failed: {str(e) or "timed out"}')
         
         except Exception as e:
             analysis['issues'].append(f'Domain analysis failed: {str(e)}')
         
+        # Only complete results are kept; failed lookups are retried next time
+        if not analysis['issues']:
+            with _domain_analysis_cache_lock:
+                _domain_analysis_cache[domain] = (time.time(), copy.deepcopy(analysis))
+        
         return analysis
 
     def get_comprehensive_ai_recommendations(self, data: Dict[str, Any], technical_analysis: Dict, content_analysis: Dict, performance_analysis: Dict) -> str:
         """Get comprehensive AI recommendations"""
         try:
+            key = _ai_cache_key(data)
+            cached = _cached_ai_recommendations(key)
+            if cached is not None:
+                print("🤖 Reusing cached AI-powered recommendations...")
+                return cached
+            
+            # Gather list-derived figures once rather than re-walking lists inside the prompt
+            title = data.get('title', '')
+            meta_description = data.get('meta_description', '')
+            images = data.get('images') or ()
+            images_without_alt = technical_analysis['details']['images_without_alt']
+            issues = technical_analysis.get('issues', []) + content_analysis.get('issues', [])
+            warnings = technical_analysis.get('warnings', []) + content_analysis.get('warnings', [])
+            good_practices = technical_analysis.get('good_practices', []) + content_analysis.get('good_practices', [])
+            
             # Prepare comprehensive data for AI analysis
             prompt = f"""
             Analyze this comprehensive website data and provide detailed SEO, AEO, and GEO recommendations:
@@ -856,8 +1486,8 @@ class AdvancedSEOAnalyzer:
             WEBSITE OVERVIEW:
             - URL: {data.get('url', '')}
             - Domain: {data.get('domain', '')}
-            - Title: {data.get('title', '')} ({len(data.get('title', ''))} chars)
-            - Meta Description: {data.get('meta_description', '')} ({len(data.get('meta_description', ''))} chars)
+            - Title: {title} ({len(title)} chars)
+            - Meta Description: {meta_description} ({len(meta_description)} chars)
             - Word Count: {content_analysis['details'].get('word_count', 0)}
             - Language: {data.get('lang', 'not specified')}
 
@@ -878,18 +1508,18 @@ class AdvancedSEOAnalyzer:
             PERFORMANCE METRICS:
             - Response Time: {data.get('response_time', 0):.2f}s
             - Page Size: {data.get('page_size', 0) / 1024:.1f}KB
-            - Images: {len(data.get('images', []))} total, {len([img for img in data.get('images', []) if not img.get('has_alt')])} without alt text
-            - CSS Files: {len(data.get('css_files', []))}
-            - JS Files: {len(data.get('js_files', []))}
+            - Images: {len(images)} total, {images_without_alt} without alt text
+            - CSS Files: {len(data.get('css_files') or ())}
+            - JS Files: {len(data.get('js_files') or ())}
 
             CRITICAL ISSUES:
-            {chr(10).join('- ' + issue for issue in technical_analysis.get('issues', []) + content_analysis.get('issues', []))}
+            {chr(10).join('- ' + issue for issue in issues)}
 
             WARNINGS:
-            {chr(10).join('- ' + warning for warning in technical_analysis.get('warnings', []) + content_analysis.get('warnings', []))}
+            {chr(10).join('- ' + warning for warning in warnings)}
 
             CURRENT GOOD PRACTICES:
-            {chr(10).join('- ' + practice for practice in technical_analysis.get('good_practices', []) + content_analysis.get('good_practices', []))}
+            {chr(10).join('- ' + practice for practice in good_practices)}
 
             Please provide comprehensive, actionable recommendations in the following categories:
 
@@ -916,17 +1546,28 @@ class AdvancedSEOAnalyzer:
             
             print("🤖 Getting comprehensive AI-powered recommendations...")
             
-            response = self.client.chat.completions.create(
-                model="gpt-4",  # Use GPT-4 for better analysis
+            stream = self.client.chat.completions.create(
+                model=AI_MODEL,
                 messages=[
                     {"role": "system", "content": "You are a world-class SEO expert with deep knowledge of traditional SEO, AEO (Answer Engine Optimization), GEO (Generative Engine Optimization), web performance, accessibility, and modern search engine algorithms. Provide detailed, actionable, and prioritized recommendations."},
                     {"role": "user", "content": prompt}
                 ],
                 max_tokens=4000,
-                temperature=0.3
+                temperature=0.3,
+                stream=True
             )
             
-            return response.choices[0].message.content
+            # Collect the streamed deltas as they arrive
+            parts = []
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+            recommendations = ''.join(parts)
+            
+            if recommendations:
+                _store_ai_recommendations(key, recommendations)
+            
+            return recommendations
             
         except Exception as e:
             print(f"⚠️ Warning: Could not get OpenAI recommendations: {str(e)}")
@@ -934,744 +1575,73 @@ class AdvancedSEOAnalyzer:
 
     def _get_fallback_recommendations(self, technical_analysis: Dict, content_analysis: Dict, performance_analysis: Dict) -> str:
         """Fallback recommendations when AI is unavailable"""
-        return """
-        # COMPREHENSIVE SEO RECOMMENDATIONS
-
-        ## 🚨 CRITICAL FIXES (High Priority)
-        - Fix all critical technical issues identified in the analysis
-        - Ensure HTTPS is properly implemented
-        - Optimize page loading speed to under 2 seconds
-        - Fix missing or poorly optimized meta tags
-
-        ## 🔍 SEO OPTIMIZATION (Traditional Search)
-        - Optimize title tags (50-60 characters with primary keywords)
-        - Write compelling meta descriptions (150-160 characters)
-        - Implement proper heading hierarchy (H1, H2, H3)
-        - Add alt text to all images
-        - Improve internal linking structure
-        - Create XML sitemap and submit to search engines
+        return FALLBACK_RECOMMENDATIONS
 
-        ## 🎯 AEO OPTIMIZATION (Answer Engine Optimization)
-        - Structure content for featured snippets
-        - Add comprehensive FAQ sections
-        - Optimize for voice search with conversational keywords
-        - Implement structured data markup (Schema.org)
-        - Create "People Also Ask" style content
-        - Optimize for local search if applicable
-
-        ## 🤖 GEO OPTIMIZATION (Generative Engine Optimization)
-        - Create authoritative, well-sourced content
-        - Use clear entity definitions and relationships
-        - Implement comprehensive topic coverage
-        - Add factual accuracy and citations
-        - Structure content for AI understanding
-        - Build topical authority through content clusters
-
-        ## ⚡ PERFORMANCE IMPROVEMENTS
-        - Optimize images (WebP format, proper sizing)
-        - Minify CSS and JavaScript files
-        - Enable compression (gzip/brotli)
-        - Implement browser caching
-        - Use a Content Delivery Network (CDN)
-        - Optimize Core Web Vitals (LCP, FID, CLS)
-
-        ## ♿ ACCESSIBILITY ENHANCEMENTS
-        - Add alt text to all images
-        - Ensure proper color contrast ratios
-        - Implement keyboard navigation
-        - Add ARIA labels where needed
-        - Use semantic HTML elements
-        - Test with screen readers
-
-        ## 🔒 SECURITY HARDENING
-        - Implement security headers (HSTS, CSP, X-Frame-Options)
-        - Keep software and plugins updated
-        - Use strong SSL/TLS configuration
-        - Implement proper authentication
-        - Regular security audits
-        - Backup strategy
-
-        ## 📝 CONTENT STRATEGY
-        - Increase content depth and quality
-        - Target long-tail keywords
-        - Create pillar pages and topic clusters
-        - Regular content updates and freshness
-        - User-generated content integration
-        - Multi-media content (videos, infographics)
-
-        ## 🔧 TECHNICAL IMPROVEMENTS
-        - Implement proper redirects (301 for permanent)
-        - Fix broken links and 404 errors
-        - Optimize URL structure
-        - Implement breadcrumb navigation
-        - Mobile-first responsive design
-        - Progressive Web App features
-
-        ## 📊 MONITORING & MAINTENANCE
-        - Set up Google Search Console and Analytics
-        - Regular SEO audits and monitoring
-        - Track keyword rankings and traffic
-        - Monitor Core Web Vitals
-        - Competitor analysis
-        - Regular content audits and updates
-        """
+    def generate_advanced_html_report(self, data: Dict[str, Any], technical_analysis: Dict, content_analysis: Dict, performance_analysis: Dict, domain_analysis: Dict, ai_recommendations: str, heading: str = REPORT_HEADING, footer: str = REPORT_FOOTER, extra_section: str = '') -> str:
+        """Generate advanced HTML report with charts and detailed analysis"""
+        context = self._report_context(data, technical_analysis, content_analysis, performance_analysis, ai_recommendations, heading, footer, extra_section)
+        return REPORT_TEMPLATES.get_template('advanced_report.html.jinja').render(context)
 
-    def _get_file_extension(self, url: str) -> str:
-        """Get file extension from URL"""
-        try:
-            return url.split('.')[-1].lower() if '.' in url else ''
-        except:
-            return ''
-
-    def _detect_video_platform(self, url: str) -> str:
-        """Detect video platform from URL"""
-        if 'youtube' in url:
-            return 'YouTube'
-        elif 'vimeo' in url:
-            return 'Vimeo'
-        elif 'dailymotion' in url:
-            return 'Dailymotion'
-        else:
-            return 'Unknown'
+    def write_advanced_html_report(self, out: IO[str], data: Dict[str, Any], technical_analysis: Dict, content_analysis: Dict, performance_analysis: Dict, domain_analysis: Dict, ai_recommendations: str, heading: str = REPORT_HEADING, footer: str = REPORT_FOOTER, extra_section: str = ''):
+        """Stream the advanced HTML report into an open text file chunk by chunk"""
+        context = self._report_context(data, technical_analysis, content_analysis, performance_analysis, ai_recommendations, heading, footer, extra_section)
+        template = REPORT_TEMPLATES.get_template('advanced_report.html.jinja')
+        if len(ai_recommendations) < REPORT_STREAM_THRESHOLD:
+            out.write(template.render(context))
+            return
+        stream = template.stream(context)
+        stream.enable_buffering(REPORT_STREAM_CHUNK)
+        stream.dump(out)
 
-    def generate_advanced_html_report(self, data: Dict[str, Any], technical_analysis: Dict, content_analysis: Dict, performance_analysis: Dict, domain_analysis: Dict, ai_recommendations: str) -> str:
-        """Generate advanced HTML report with charts and detailed analysis"""
-        
-        # Calculate overall scores
-        technical_score = (technical_analysis['score'] / technical_analysis['max_score']) * 100
-        content_score = (content_analysis['score'] / content_analysis['max_score']) * 100
+    def _report_context(self, data: Dict[str, Any], technical_analysis: Dict, content_analysis: Dict, performance_analysis: Dict, ai_recommendations: str, heading: str = REPORT_HEADING, footer: str = REPORT_FOOTER, extra_section: str = '') -> Dict[str, Any]:
+        """Precompute every value the report template displays; extra_section is trusted HTML placed before the recommendations"""
+        # Calculate overall scores as whole percentages, dividing once per score
+        technical_score = percent(technical_analysis['score'], technical_analysis['max_score'])
+        content_score = percent(content_analysis['score'], content_analysis['max_score'])
         performance_score = performance_analysis['score']
-        overall_score = (technical_score + content_score + performance_score) / 3
+        overall_score = overall_percent(technical_analysis, content_analysis, performance_analysis)
         
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
         
         # Generate performance chart data
         performance_data = {
             'Technical SEO': technical_score,
             'Content Quality': content_score,
             'Performance': performance_score,
-            'Accessibility': (technical_analysis['categories']['accessibility']['score'] / technical_analysis['categories']['accessibility']['max']) * 100,
-            'Security': (technical_analysis['categories']['security']['score'] / technical_analysis['categories']['security']['max']) * 100
+            'Accessibility': percent(technical_analysis['categories']['accessibility']['score'], technical_analysis['categories']['accessibility']['max']),
+            'Security': percent(technical_analysis['categories']['security']['score'], technical_analysis['categories']['security']['max'])
         }
         
-        html_template = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Advanced SEO Analysis Report - {data.get('domain', '')}</title>
-    <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/Chart.js/3.9.1/chart.min.js"></script>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #2b59ff 0%, #1a4bff 100%);
-            min-height: 100vh;
-            color: #333;
-            line-height: 1.6;
-        }}
-        
-        .container {{
-            max-width: 1400px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-        
-        .header {{
-            background: rgba(255, 255, 255, 0.95);
-            border-radius: 20px;
-            padding: 40px;
-            margin-bottom: 30px;
-            box-shadow: 0 20px 40px rgba(0, 0, 0, 0.1);
-            backdrop-filter: blur(10px);
-            animation: slideDown 0.8s ease-out;
-            text-align: center;
-        }}
-        
-        .header h1 {{
-            color: #2b59ff;
-            font-size: 3em;
-            margin-bottom: 10px;
-            font-weight: 700;
-        }}
-        
-        .header .subtitle {{
-            color: #666;
-            font-size: 1.2em;
-            margin-bottom: 20px;
-        }}
-        
-        .header .url {{
-            color: #2b59ff;
-            font-size: 1.4em;
-            font-weight: 600;
-            margin-bottom: 30px;
-        }}
-        
-        .score-dashboard {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            margin: 30px 0;
-        }}
-        
-        .score-card {{
-            background: white;
-            border-radius: 15px;
-            padding: 25px;
-            text-align: center;
-            box-shadow: 0 10px 25px rgba(0, 0, 0, 0.1);
-            transition: transform 0.3s ease;
-        }}
-        
-        .score-card:hover {{
-            transform: translateY(-5px);
-        }}
-        
-        .score-circle {{
-            width: 100px;
-            height: 100px;
-            border-radius: 50%;
-            margin: 0 auto 15px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-size: 1.5em;
-            font-weight: bold;
-            color: white;
-            position: relative;
-        }}
-        
-        .score-excellent {{ background: conic-gradient(#4caf50 var(--percentage), #e0e0e0 0deg); }}
-        .score-good {{ background: conic-gradient(#8bc34a var(--percentage), #e0e0e0 0deg); }}
-        .score-average {{ background: conic-gradient(#ff9800 var(--percentage), #e0e0e0 0deg); }}
-        .score-poor {{ background: conic-gradient(#f44336 var(--percentage), #e0e0e0 0deg); }}
-        
-        .score-inner {{
-            width: 80px;
-            height: 80px;
-            border-radius: 50%;
-            background: white;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            color: #333;
-        }}
-        
-        .report-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(400px, 1fr));
-            gap: 30px;
-            margin-bottom: 30px;
-        }}
-        
-        .report-card {{
-            background: rgba(255, 255, 255, 0.95);
-            border-radius: 20px;
-            padding: 30px;
-            box-shadow: 0 15px 35px rgba(0, 0, 0, 0.1);
-            backdrop-filter: blur(10px);
-            animation: slideUp 0.8s ease-out;
-            transition: transform 0.3s ease;
-        }}
-        
-        .report-card:hover {{
-            transform: translateY(-5px);
-        }}
-        
-        .card-header {{
-            display: flex;
-            align-items: center;
-            margin-bottom: 25px;
-            padding-bottom: 15px;
-            border-bottom: 2px solid #f0f0f0;
-        }}
-        
-        .card-icon {{
-            width: 50px;
-            height: 50px;
-            border-radius: 12px;
-            background: linear-gradient(135deg, #2b59ff, #1a4bff);
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            margin-right: 20px;
-            color: white;
-            font-size: 1.5em;
-        }}
-        
-        .card-title {{
-            font-size: 1.8em;
-            color: #2b59ff;
-            font-weight: 600;
-        }}
-        
-        .metric {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            padding: 12px 0;
-            border-bottom: 1px solid #f5f5f5;
-        }}
-        
-        .metric:last-child {{
-            border-bottom: none;
-        }}
-        
-        .metric-label {{
-            color: #666;
-            font-weight: 500;
-        }}
-        
-        .metric-value {{
-            font-weight: 600;
-            color: #333;
-        }}
-        
-        .status-excellent {{ color: #4caf50; }}
-        .status-good {{ color: #8bc34a; }}
-        .status-warning {{ color: #ff9800; }}
-        .status-error {{ color: #f44336; }}
-        
-        .issues-section {{
-            margin: 20px 0;
-        }}
-        
-        .issues-list {{
-            list-style: none;
-            margin: 15px 0;
-        }}
-        
-        .issues-list li {{
-            padding: 10px 15px;
-            margin: 8px 0;
-            border-radius: 8px;
-            position: relative;
-            padding-left: 45px;
-        }}
-        
-        .issue-critical {{
-            background: #ffebee;
-            border-left: 4px solid #f44336;
-            color: #c62828;
-        }}
-        
-        .issue-warning {{
-            background: #fff3e0;
-            border-left: 4px solid #ff9800;
-            color: #ef6c00;
-        }}
-        
-        .issue-good {{
-            background: #e8f5e8;
-            border-left: 4px solid #4caf50;
-            color: #2e7d32;
-        }}
-        
-        .issue-critical:before {{ content: "🚨"; position: absolute; left: 15px; }}
-        .issue-warning:before {{ content: "⚠️"; position: absolute; left: 15px; }}
-        .issue-good:before {{ content: "✅"; position: absolute; left: 15px; }}
-        
-        .chart-container {{
-            background: white;
-            border-radius: 20px;
-            padding: 30px;
-            margin: 30px 0;
-            box-shadow: 0 15px 35px rgba(0, 0, 0, 0.1);
-        }}
-        
-        .recommendations {{
-            background: rgba(255, 255, 255, 0.95);
-            border-radius: 20px;
-            padding: 40px;
-            box-shadow: 0 15px 35px rgba(0, 0, 0, 0.1);
-            backdrop-filter: blur(10px);
-            animation: slideUp 0.8s ease-out 0.2s both;
-            margin: 30px 0;
-        }}
-        
-        .recommendations h2 {{
-            color: #2b59ff;
-            margin-bottom: 25px;
-            font-size: 2.2em;
-            text-align: center;
-        }}
-        
-        .ai-content {{
-            line-height: 1.8;
-            color: #444;
-            white-space: pre-wrap;
-            font-size: 1.1em;
-        }}
-        
-        .tabs {{
-            display: flex;
-            background: #f8f9fa;
-            border-radius: 10px;
-            padding: 5px;
-            margin-bottom: 20px;
-        }}
-        
-        .tab {{
-            flex: 1;
-            padding: 12px 20px;
-            text-align: center;
-            border-radius: 8px;
-            cursor: pointer;
-            transition: all 0.3s ease;
-            font-weight: 600;
-        }}
-        
-        .tab.active {{
-            background: #2b59ff;
-            color: white;
-        }}
-        
-        .tab-content {{
-            display: none;
-        }}
-        
-        .tab-content.active {{
-            display: block;
-        }}
-        
-        .progress-bar {{
-            width: 100%;
-            height: 10px;
-            background: #e0e0e0;
-            border-radius: 5px;
-            overflow: hidden;
-            margin: 10px 0;
-        }}
-        
-        .progress-fill {{
-            height: 100%;
-            border-radius: 5px;
-            transition: width 1.5s ease-out;
-        }}
-        
-        .footer {{
-            text-align: center;
-            color: rgba(255, 255, 255, 0.9);
-            margin-top: 50px;
-            padding: 30px;
-            font-size: 1.1em;
-        }}
-        
-        @keyframes slideDown {{
-            from {{ opacity: 0; transform: translateY(-50px); }}
-            to {{ opacity: 1; transform: translateY(0); }}
-        }}
-        
-        @keyframes slideUp {{
-            from {{ opacity: 0; transform: translateY(50px); }}
-            to {{ opacity: 1; transform: translateY(0); }}
-        }}
-        
-        @media (max-width: 768px) {{
-            .container {{ padding: 10px; }}
-            .header h1 {{ font-size: 2em; }}
-            .report-grid {{ grid-template-columns: 1fr; }}
-            .score-dashboard {{ grid-template-columns: repeat(2, 1fr); }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🔍 Advanced SEO Analysis Report</h1>
-            <div class="subtitle">Comprehensive Website Analysis & Optimization Recommendations</div>
-            <div class="url">{data.get('url', '')}</div>
-            
-            <div class="score-dashboard">
-                <div class="score-card">
-                    <div class="score-circle score-{'excellent' if overall_score >= 80 else 'good' if overall_score >= 60 else 'average' if overall_score >= 40 else 'poor'}" style="--percentage: {overall_score * 3.6}deg;">
-                        <div class="score-inner">{overall_score:.0f}</div>
-                    </div>
-                    <h3>Overall Score</h3>
-                </div>
-                <div class="score-card">
-                    <div class="score-circle score-{'excellent' if technical_score >= 80 else 'good' if technical_score >= 60 else 'average' if technical_score >= 40 else 'poor'}" style="--percentage: {technical_score * 3.6}deg;">
-                        <div class="score-inner">{technical_score:.0f}</div>
-                    </div>
-                    <h3>Technical SEO</h3>
-                </div>
-                <div class="score-card">
-                    <div class="score-circle score-{'excellent' if content_score >= 80 else 'good' if content_score >= 60 else 'average' if content_score >= 40 else 'poor'}" style="--percentage: {content_score * 3.6}deg;">
-                        <div class="score-inner">{content_score:.0f}</div>
-                    </div>
-                    <h3>Content Quality</h3>
-                </div>
-                <div class="score-card">
-                    <div class="score-circle score-{'excellent' if performance_score >= 80 else 'good' if performance_score >= 60 else 'average' if performance_score >= 40 else 'poor'}" style="--percentage: {performance_score * 3.6}deg;">
-                        <div class="score-inner">{performance_score:.0f}</div>
-                    </div>
-                    <h3>Performance</h3>
-                </div>
-            </div>
-            
-            <div style="color: #666; margin-top: 20px;">
-                Generated on {timestamp} | Analysis Version 2.0
-            </div>
-        </div>
-        
-        <div class="chart-container">
-            <h2 style="color: #2b59ff; margin-bottom: 20px;">📊 Performance Overview</h2>
-            <canvas id="performanceChart" width="400" height="200"></canvas>
-        </div>
-        
-        <div class="report-grid">
-            <div class="report-card">
-                <div class="card-header">
-                    <div class="card-icon">🔧</div>
-                    <div class="card-title">Technical SEO Analysis</div>
-                </div>
-                
-                <div class="tabs">
-                    <div class="tab active" onclick="showTab('technical-basic')">Basic</div>
-                    <div class="tab" onclick="showTab('technical-performance')">Performance</div>
-                    <div class="tab" onclick="showTab('technical-security')">Security</div>
-                </div>
-                
-                <div id="technical-basic" class="tab-content active">
-                    <div class="metric">
-                        <span class="metric-label">Title Length</span>
-                        <span class="metric-value status-{'good' if 30 <= len(data.get('title', '')) <= 60 else 'warning'}">{len(data.get('title', ''))} chars</span>
-                    </div>
-                    <div class="metric">
-                        <span class="metric-label">Meta Description</span>
-                        <span class="metric-value status-{'good' if 120 <= len(data.get('meta_description', '')) <= 160 else 'warning'}">{len(data.get('meta_description', ''))} chars</span>
-                    </div>
-                    <div class="metric">
-                        <span class="metric-label">H1 Tags</span>
-                        <span class="metric-value status-{'good' if len(data.get('h1_tags', [])) == 1 else 'warning'}">{len(data.get('h1_tags', []))}</span>
-                    </div>
-                    <div class="metric">
-                        <span class="metric-label">Canonical URL</span>
-                        <span class="metric-value status-{'good' if data.get('canonical_url') else 'warning'}">{'Set' if data.get('canonical_url') else 'Missing'}</span>
-                    </div>
-                    <div class="metric">
-                        <span class="metric-label">Structured Data</span>
-                        <span class="metric-value">{len(data.get('structured_data', []))} items</span>
-                    </div>
-                </div>
-                
-                <div id="technical-performance" class="tab-content">
-                    <div class="metric">
-                        <span class="metric-label">Response Time</span>
-                        <span class="metric-value status-{'excellent' if data.get('response_time', 0) < 1 else 'good' if data.get('response_time', 0) < 2 else 'warning'}">{data.get('response_time', 0):.2f}s</span>
-                    </div>
-                    <div class="metric">
-                        <span class="metric-label">Page Size</span>
-                        <span class="metric-value">{data.get('page_size', 0) / 1024:.1f} KB</span>
-                    </div>
-                    <div class="metric">
-                        <span class="metric-label">Compression</span>
-                        <span class="metric-value status-{'good' if data.get('compression') else 'warning'}">{'Enabled' if data.get('compression') else 'Disabled'}</span>
-                    </div>
-                    <div class="metric">
-                        <span class="metric-label">CSS Files</span>
-                        <span class="metric-value">{len(data.get('css_files', []))}</span>
-                    </div>
-                    <div class="metric">
-                        <span class="metric-label">JS Files</span>
-                        <span class="metric-value">{len(data.get('js_files', []))}</span>
-                    </div>
-                </div>
-                
-                <div id="technical-security" class="tab-content">
-                    <div class="metric">
-                        <span class="metric-label">HTTPS</span>
-                        <span class="metric-value status-{'good' if data.get('https') else 'error'}">{'Enabled' if data.get('https') else 'Disabled'}</span>
-                    </div>
-                    <div class="metric">
-                        <span class="metric-label">Security Headers</span>
-                        <span class="metric-value">{len(data.get('security_headers', {}))}/6</span>
-                    </div>
-                    <div class="metric">
-                        <span class="metric-label">Redirects</span>
-                        <span class="metric-value">{data.get('redirects', 0)}</span>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="report-card">
-                <div class="card-header">
-                    <div class="card-icon">📝</div>
-                    <div class="card-title">Content Analysis</div>
-                </div>
-                
-                <div class="metric">
-                    <span class="metric-label">Word Count</span>
-                    <span class="metric-value status-{'good' if content_analysis['details'].get('word_count', 0) >= 300 else 'warning'}">{content_analysis['details'].get('word_count', 0)}</span>
-                </div>
-                <div class="metric">
-                    <span class="metric-label">Readability Score</span>
-                    <span class="metric-value">{content_analysis['details'].get('flesch_reading_ease', 'N/A')}</span>
-                </div>
-                <div class="metric">
-                    <span class="metric-label">Language</span>
-                    <span class="metric-value">{content_analysis['details'].get('detected_language', 'Unknown')}</span>
-                </div>
-                <div class="metric">
-                    <span class="metric-label">Internal Links</span>
-                    <span class="metric-value">{len(data.get('internal_links', []))}</span>
-                </div>
-                <div class="metric">
-                    <span class="metric-label">External Links</span>
-                    <span class="metric-value">{len(data.get('external_links', []))}</span>
-                </div>
-                <div class="metric">
-                    <span class="metric-label">Images</span>
-                    <span class="metric-value">{len(data.get('images', []))}</span>
-                </div>
-            </div>
-            
-            <div class="report-card">
-                <div class="card-header">
-                    <div class="card-icon">⚡</div>
-                    <div class="card-title">Performance Metrics</div>
-                </div>
-                
-                <div class="metric">
-                    <span class="metric-label">Load Time</span>
-                    <span class="metric-value">{performance_analysis['metrics'].get('response_time_ms', 0):.0f}ms</span>
-                </div>
-                <div class="metric">
-                    <span class="metric-label">Page Weight</span>
-                    <span class="metric-value">{performance_analysis['metrics'].get('page_size_kb', 0):.1f}KB</span>
-                </div>
-                <div class="metric">
-                    <span class="metric-label">Resource Count</span>
-                    <span class="metric-value">{performance_analysis['metrics'].get('css_files', 0) + performance_analysis['metrics'].get('js_files', 0)}</span>
-                </div>
-                <div class="metric">
-                    <span class="metric-label">Image Optimization</span>
-                    <span class="metric-value status-{'good' if len([img for img in data.get('images', []) if not img.get('has_alt')]) == 0 else 'warning'}">{len([img for img in data.get('images', []) if img.get('has_alt')])}/{len(data.get('images', []))}</span>
-                </div>
-            </div>
-            
-            <div class="report-card">
-                <div class="card-header">
-                    <div class="card-icon">🎯</div>
-                    <div class="card-title">Issues & Recommendations</div>
-                </div>
-                
-                <div class="issues-section">
-                    <h4>Critical Issues</h4>
-                    <ul class="issues-list">
-                        {"".join([f'<li class="issue-critical">{issue}</li>' for issue in technical_analysis.get('issues', []) + content_analysis.get('issues', [])])}
-                        {f'<li class="issue-good">No critical issues found!</li>' if not (technical_analysis.get('issues', []) + content_analysis.get('issues', [])) else ''}
-                    </ul>
-                </div>
-                
-                <div class="issues-section">
-                    <h4>Warnings</h4>
-                    <ul class="issues-list">
-                        {"".join([f'<li class="issue-warning">{warning}</li>' for warning in technical_analysis.get('warnings', []) + content_analysis.get('warnings', [])])}
-                        {f'<li class="issue-good">No warnings!</li>' if not (technical_analysis.get('warnings', []) + content_analysis.get('warnings', [])) else ''}
-                    </ul>
-                </div>
-                
-                <div class="issues-section">
-                    <h4>Good Practices</h4>
-                    <ul class="issues-list">
-                        {"".join([f'<li class="issue-good">{practice}</li>' for practice in technical_analysis.get('good_practices', []) + content_analysis.get('good_practices', [])])}
-                    </ul>
-                </div>
-            </div>
-        </div>
-        
-        <div class="recommendations">
-            <h2>🤖 AI-Powered Comprehensive Recommendations</h2>
-            <div class="ai-content">{ai_recommendations}</div>
-        </div>
-        
-        <div class="footer">
-            <p>🚀 Advanced SEO Analysis Report • Powered by OpenAI GPT-4 • Generated with ❤️</p>
-            <p>For best results, implement recommendations in order of priority and re-analyze monthly</p>
-        </div>
-    </div>
-    
-    <script>
-        // Performance Chart
-        const ctx = document.getElementById('performanceChart').getContext('2d');
-        new Chart(ctx, {{
-            type: 'radar',
-            data: {{
-                labels: {list(performance_data.keys())},
-                datasets: [{{
-                    label: 'Current Performance',
-                    data: {list(performance_data.values())},
-                    backgroundColor: 'rgba(43, 89, 255, 0.2)',
-                    borderColor: 'rgba(43, 89, 255, 1)',
-                    borderWidth: 2,
-                    pointBackgroundColor: 'rgba(43, 89, 255, 1)',
-                    pointBorderColor: '#fff',
-                    pointHoverBackgroundColor: '#fff',
-                    pointHoverBorderColor: 'rgba(43, 89, 255, 1)'
-                }}]
-            }},
-            options: {{
-                responsive: true,
-                scales: {{
-                    r: {{
-                        beginAtZero: true,
-                        max: 100,
-                        ticks: {{
-                            stepSize: 20
-                        }}
-                    }}
-                }},
-                plugins: {{
-                    legend: {{
-                        display: false
-                    }}
-                }}
-            }}
-        }});
-        
-        // Tab functionality
-        function showTab(tabId) {{
-            // Hide all tab contents
-            document.querySelectorAll('.tab-content').forEach(content => {{
-                content.classList.remove('active');
-            }});
-            
-            // Remove active class from all tabs
-            document.querySelectorAll('.tab').forEach(tab => {{
-                tab.classList.remove('active');
-            }});
-            
-            // Show selected tab content
-            document.getElementById(tabId).classList.add('active');
-            
-            // Add active class to clicked tab
-            event.target.classList.add('active');
-        }}
-        
-        // Animate progress bars on load
-        window.addEventListener('load', function() {{
-            document.querySelectorAll('.progress-fill').forEach(bar => {{
-                const width = bar.getAttribute('data-width');
-                bar.style.width = width + '%';
-            }});
-        }});
-    </script>
-</body>
-</html>
-        """
-        
-        return html_template
+        metrics = report_metrics(data, technical_analysis, content_analysis, performance_analysis)
+        status = report_status(metrics)
+        
+        return {
+            'data': data,
+            'heading': heading,
+            'footer': footer,
+            'extra_section': Markup(extra_section),
+            'ai_recommendations': ai_recommendations,
+            'timestamp': timestamp,
+            # Serialised once here; labels are fixed strings and values are numbers, so plain JSON is script-safe
+            'chart_labels': Markup(orjson.dumps(list(performance_data)).decode()),
+            'chart_values': Markup(orjson.dumps(list(performance_data.values())).decode()),
+            'metrics': metrics,
+            'status': status,
+            'technical_tabs': technical_tabs(metrics, status),
+            'score_cards': [
+                score_card('Overall Score', overall_score),
+                score_card('Technical SEO', technical_score),
+                score_card('Content Quality', content_score),
+                score_card('Performance', performance_score)
+            ],
+            'issues': technical_analysis.get('issues', []) + content_analysis.get('issues', []),
+            'warnings': technical_analysis.get('warnings', []) + content_analysis.get('warnings', []),
+            'good_practices': technical_analysis.get('good_practices', []) + content_analysis.get('good_practices', []),
+            'report_css': REPORT_CSS,
+            'report_js': REPORT_JS
+        }
 
-    def run_comprehensive_analysis(self, url: str):
+    def run_comprehensive_analysis(self, url: str, gzip_copy: bool = True):
         """Run comprehensive SEO analysis"""
         print(f"\n🚀 Starting comprehensive SEO analysis for: {url}")
         print("=" * 80)
@@ -1683,74 +1653,99 @@ class AdvancedSEOAnalyzer:
         
         print("✅ Website data fetched successfully")
         
-        # Run advanced technical SEO analysis
+        # Run link checks, technical, content, performance and domain analysis side by side
+        print("🔗 Checking links for errors...")
         print("🔧 Analyzing advanced technical SEO...")
-        technical_analysis = self.analyze_technical_seo_advanced(data)
-        
-        # Run advanced content analysis
         print("📝 Analyzing content with NLP...")
-        content_analysis = self.analyze_content_advanced(data)
-        
-        # Run performance analysis
         print("⚡ Analyzing performance metrics...")
-        performance_analysis = self.analyze_performance_metrics(data)
-        
-        # Run domain analysis
         print("🌐 Analyzing domain authority...")
-        domain_analysis = self.analyze_domain_authority(data['domain'])
+        stages = self.run_analysis_stages(data, check_links=True)
+        technical_analysis = stages['technical']
+        content_analysis = stages['content']
+        performance_analysis = stages['performance']
+        domain_analysis = stages['domain']
         
         # Get comprehensive AI recommendations
         ai_recommendations = self.get_comprehensive_ai_recommendations(
             data, technical_analysis, content_analysis, performance_analysis
         )
         
-        # Generate advanced HTML report
+        # Generate advanced HTML report, streaming it straight to disk
         print("📊 Generating advanced HTML report...")
-        html_report = self.generate_advanced_html_report(
-            data, technical_analysis, content_analysis, performance_analysis, domain_analysis, ai_recommendations
-        )
-        
-        # Save report
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        domain = urlparse(url).netloc.replace('www.', '')
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        domain = data['domain'].replace('www.', '')
         filename = f"advanced_seo_report_{domain}_{timestamp}.html"
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(html_report)
+        # One render feeds both the plain report and, if wanted, a compressed copy for sharing
+        with open(filename, 'w', encoding='utf-8', buffering=REPORT_FILE_BUFFER) as f:
+            if gzip_copy:
+                with gzip.open(f"{filename}.gz", 'wt', encoding='utf-8', compresslevel=6) as gz:
+                    self.write_advanced_html_report(
+                        _TeeWriter(f, gz), data, technical_analysis, content_analysis, performance_analysis, domain_analysis, ai_recommendations
+                    )
+            else:
+                self.write_advanced_html_report(
+                    f, data, technical_analysis, content_analysis, performance_analysis, domain_analysis, ai_recommendations
+                )
         
         # Print summary
-        technical_score = (technical_analysis['score'] / technical_analysis['max_score']) * 100
-        content_score = (content_analysis['score'] / content_analysis['max_score']) * 100
-        overall_score = (technical_score + content_score + performance_analysis['score']) / 3
+        technical_score = percent(technical_analysis['score'], technical_analysis['max_score'])
+        content_score = percent(content_analysis['score'], content_analysis['max_score'])
+        overall_score = overall_percent(technical_analysis, content_analysis, performance_analysis)
         
         print(f"\n📊 ANALYSIS SUMMARY")
         print("=" * 50)
-        print(f"🎯 Overall Score: {overall_score:.1f}/100")
-        print(f"🔧 Technical SEO: {technical_score:.1f}/100")
-        print(f"📝 Content Quality: {content_score:.1f}/100")
+        print(f"🎯 Overall Score: {overall_score}/100")
+        print(f"🔧 Technical SEO: {technical_score}/100")
+        print(f"📝 Content Quality: {content_score}/100")
         print(f"⚡ Performance: {performance_analysis['score']}/100")
-        print(f"\n🚨 Critical Issues: {len(technical_analysis.get('issues', []) + content_analysis.get('issues', []))}")
-        print(f"⚠️  Warnings: {len(technical_analysis.get('warnings', []) + content_analysis.get('warnings', []))}")
-        print(f"✅ Good Practices: {len(technical_analysis.get('good_practices', []) + content_analysis.get('good_practices', []))}")
+        print(f"\n🚨 Critical Issues: {len(technical_analysis.get('issues', [])) + len(content_analysis.get('issues', []))}")
+        print(f"⚠️  Warnings: {len(technical_analysis.get('warnings', [])) + len(content_analysis.get('warnings', []))}")
+        print(f"✅ Good Practices: {len(technical_analysis.get('good_practices', [])) + len(content_analysis.get('good_practices', []))}")
         
         print(f"\n✅ Advanced report saved as: {filename}")
+        if gzip_copy:
+            print(f"🗜️  Compressed copy saved as: {filename}.gz")
         print(f"🌐 Open the file in your browser to view the comprehensive analysis")
         print("=" * 80)
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description='Advanced SEO Analysis Tool')
+    parser.add_argument('url', nargs='?', help='Website URL to analyze')
+    parser.add_argument('--serve', action='store_true', help='Read URLs from stdin, one per line, and analyze each with one shared analyzer')
+    args = parser.parse_args()
+    
     print("🔍 Advanced SEO Analysis Tool v2.0")
     print("=" * 50)
     
-    # Check if .env file exists
-    if not os.path.exists('.env'):
-        print("❌ Error: .env file not found!")
+    # .env was already loaded at import, so check the key itself; this needs no
+    # file probe and accepts a key exported by the shell without any .env file
+    if not os.getenv('OPENAI_API_KEY'):
+        print("❌ Error: OPENAI_API_KEY not found!")
         print("Please create a .env file with your OpenAI API key:")
         print("OPENAI_API_KEY=your_api_key_here")
         sys.exit(1)
     
+    if args.serve:
+        # One analyzer for the whole session: the HTTP session, OpenAI client,
+        # templates and caches are built once and reused for every URL
+        print("📥 Reading URLs from stdin, one per line (Ctrl-D to stop)")
+        with AdvancedSEOAnalyzer() as analyzer:
+            for line in sys.stdin:
+                url = line.strip()
+                if not url:
+                    continue
+                if not url.startswith(('http://', 'https://')):
+                    url = 'https://' + url
+                try:
+                    analyzer.run_comprehensive_analysis(url)
+                except Exception as e:
+                    print(f"❌ Error analyzing {url}: {str(e)}")
+        return
+    
     # Get URL from user
-    url = input("🌐 Enter the website URL to analyze: ").strip()
+    url = args.url or input("🌐 Enter the website URL to analyze: ").strip()
     
     if not url:
         print("❌ Error: No URL provided")
@@ -1761,8 +1756,8 @@ def main():
         url = 'https://' + url
     
     # Initialize analyzer and run analysis
-    analyzer = AdvancedSEOAnalyzer()
-    analyzer.run_comprehensive_analysis(url)
+    with AdvancedSEOAnalyzer() as analyzer:
+        analyzer.run_comprehensive_analysis(url)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
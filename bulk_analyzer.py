@@ -5,35 +5,397 @@ Analyzes multiple URLs, sitemaps, and generates comprehensive reports
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_CA_BUNDLE_PATH
+from urllib3.util.retry import Retry
+from urllib3.util.ssl_ import create_urllib3_context
+from lxml import etree
 from urllib.parse import urljoin, urlparse
-import xml.etree.ElementTree as ET
 import json
+import hashlib
+import re
 import time
 import csv
-from typing import Dict, List, Any, Optional
+import random
+import ssl
+from io import BytesIO
+import asyncio
+from contextlib import nullcontext
+from typing import Dict, List, Any, Optional, Tuple
 import concurrent.futures
-from threading import Lock
+from threading import Lock, get_ident
 import openai
 from dotenv import load_dotenv
 import os
 from datetime import datetime
-import pandas as pd
+
+from page_parser import parse_html, walk_page
 
 load_dotenv()
 
+# Page elements counted by _extract_from_tree
+HEADING_COUNTS = {'h1': 'h1_count', 'h2': 'h2_count', 'h3': 'h3_count'}
+NETLOC_RE = re.compile(r'^https?://([^/?#]*)', re.IGNORECASE)
+
+# Sitemap protocol elements read by parse_sitemap
+SITEMAP_NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+SITEMAP_LOC = SITEMAP_NS + 'loc'
+SITEMAP_URL = SITEMAP_NS + 'url'
+SITEMAP_ENTRY = SITEMAP_NS + 'sitemap'
+SITEMAP_TAGS = (SITEMAP_LOC, SITEMAP_URL, SITEMAP_ENTRY)
+# A sitemap body opens on a <urlset> or <sitemapindex> root, possibly after
+# an XML declaration, comments, processing instructions or a DOCTYPE;
+# anything else (typically an HTML error page) is not parsed
+SITEMAP_ROOT_RE = re.compile(
+    rb'(?:\s|<\?.*?\?>|<!--.*?-->|<!DOCTYPE[^\[>]*(?:\[.*?\])?\s*>)*<(?:[\w.-]+:)?(?:urlset|sitemapindex)[\s/>]',
+    re.DOTALL | re.IGNORECASE
+)
+
+# Pages are analyzed from at most this many bytes of HTML
+MAX_PAGE_BYTES = 5 * 1024 * 1024
+
+# Connection pool size: hosts kept, and connections kept per host
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 64
+
+def _shared_ssl_context() -> Tuple[Optional[ssl.SSLContext], str]:
+    """TLS context preloaded with the CA bundle requests verifies against, and that bundle's path"""
+    # requests' environment overrides come first, as they do for its own verification
+    ca_bundle = os.environ.get('REQUESTS_CA_BUNDLE') or os.environ.get('CURL_CA_BUNDLE') or DEFAULT_CA_BUNDLE_PATH
+    try:
+        context = create_urllib3_context()
+        context.minimum_version = ssl.TLSVersion.TLSv1_2
+        if os.path.isdir(ca_bundle):
+            context.load_verify_locations(capath=ca_bundle)
+        else:
+            context.load_verify_locations(cafile=ca_bundle)
+        return context, ca_bundle
+    except Exception as e:
+        # Left to requests, which reports the unusable bundle on each HTTPS request
+        print(f"⚠️ Could not load CA bundle {ca_bundle}: {str(e)}")
+        return None, ca_bundle
+
+def _extract_from_tree(tree, domain: str) -> Dict[str, Any]:
+    """Collect the bulk SEO fields from a parsed page in a single walk of the tree"""
+    found = {
+        'title': None,
+        'meta_description': None,
+        'canonical_url': None,
+        'robots_meta': None
+    }
+    counts = dict.fromkeys(HEADING_COUNTS.values(), 0)
+    word_count = image_count = images_without_alt = 0
+    internal_links = external_links = structured_data_count = 0
+    
+    # Words split across adjacent tags count once, as in get_text()
+    in_word = False
+    for event, element, text in walk_page(tree):
+        if text:
+            words = len(text.split())
+            if in_word and words and not text[0].isspace():
+                words -= 1
+            word_count += words
+            in_word = not text[-1].isspace()
+        if event != 'start':
+            continue
+        
+        tag = element.tag
+        if tag in HEADING_COUNTS:
+            counts[HEADING_COUNTS[tag]] += 1
+        elif tag == 'img':
+            image_count += 1
+            if not element.get('alt'):
+                images_without_alt += 1
+        elif tag == 'a':
+            href = element.get('href')
+            if href is None:
+                continue
+            # One regex match yields the host of absolute links; root-relative
+            # links are internal, and fragment, mailto: and javascript: links are not counted
+            absolute = NETLOC_RE.match(href)
+            if absolute:
+                if absolute.group(1) == domain:
+                    internal_links += 1
+                else:
+                    external_links += 1
+            elif href.startswith('/'):
+                internal_links += 1
+        elif tag == 'script':
+            if element.get('type') == 'application/ld+json':
+                structured_data_count += 1
+        elif tag == 'title':
+            if found['title'] is None:
+                found['title'] = element.text_content().strip()
+        elif tag == 'meta':
+            name = element.get('name')
+            if name == 'description' and found['meta_description'] is None:
+                found['meta_description'] = element.get('content', '')
+            elif name == 'robots' and found['robots_meta'] is None:
+                found['robots_meta'] = element.get('content', '')
+        elif tag == 'link':
+            if found['canonical_url'] is None and 'canonical' in (element.get('rel') or '').split():
+                found['canonical_url'] = element.get('href', '')
+    
+    title = found['title'] or ''
+    meta_description = found['meta_description'] or ''
+    return dict(
+        counts,
+        title=title,
+        title_length=len(title),
+        meta_description=meta_description,
+        meta_description_length=len(meta_description),
+        canonical_url=found['canonical_url'] or '',
+        robots_meta=found['robots_meta'] or '',
+        word_count=word_count,
+        image_count=image_count,
+        images_without_alt=images_without_alt,
+        internal_links=internal_links,
+        external_links=external_links,
+        structured_data_count=structured_data_count
+    )
+
+def analyze_page(url: str, body: bytes, response_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract and score the bulk SEO fields of a downloaded page; pure, so it can run in a worker process"""
+    tree = parse_html(body)
+    
+    # Extract basic SEO data
+    analysis = {
+        'url': url,
+        'status': 'success',
+        'status_code': response_info['status_code'],
+        'response_time': response_info['response_time'],
+        'page_size': response_info.get('page_size', len(body)),
+    
+        # SEO Elements
+        'title': '',
+        'title_length': 0,
+        'meta_description': '',
+        'meta_description_length': 0,
+        'h1_count': 0,
+        'h2_count': 0,
+        'h3_count': 0,
+    
+        # Content Analysis
+        'word_count': 0,
+        'image_count': 0,
+        'images_without_alt': 0,
+        'internal_links': 0,
+        'external_links': 0,
+    
+        # Technical
+        'canonical_url': '',
+        'robots_meta': '',
+        'structured_data_count': 0,
+        'https': url.startswith('https'),
+    
+        # Issues
+        'issues': [],
+        'warnings': [],
+        'score': 0
+    }
+    analysis.update(_extract_from_tree(tree, urlparse(url).netloc))
+    
+    # Basic SEO scoring and issue detection
+    score = 0
+    
+    # Title analysis
+    if not analysis['title']:
+        analysis['issues'].append('Missing title tag')
+    elif analysis['title_length'] < 30:
+        analysis['warnings'].append('Title too short')
+    elif analysis['title_length'] > 60:
+        analysis['warnings'].append('Title too long')
+    else:
+        score += 20
+    
+    # Meta description analysis
+    if not analysis['meta_description']:
+        analysis['issues'].append('Missing meta description')
+    elif analysis['meta_description_length'] < 120:
+        analysis['warnings'].append('Meta description too short')
+    elif analysis['meta_description_length'] > 160:
+        analysis['warnings'].append('Meta description too long')
+    else:
+        score += 20
+    
+    # H1 analysis
+    if analysis['h1_count'] == 0:
+        analysis['issues'].append('Missing H1 tag')
+    elif analysis['h1_count'] > 1:
+        analysis['warnings'].append('Multiple H1 tags')
+    else:
+        score += 15
+    
+    # Image analysis
+    if analysis['images_without_alt'] > 0:
+        analysis['warnings'].append(f'{analysis["images_without_alt"]} images without alt text')
+    else:
+        score += 15
+    
+    # Content analysis
+    if analysis['word_count'] < 300:
+        analysis['warnings'].append('Low word count')
+    else:
+        score += 15
+    
+    # Technical analysis
+    if not analysis['canonical_url']:
+        analysis['warnings'].append('Missing canonical URL')
+    else:
+        score += 10
+    
+    if not analysis['https']:
+        analysis['issues'].append('Not using HTTPS')
+    else:
+        score += 5
+    
+    analysis['score'] = score
+    
+    return analysis
+
+# Analyzed pages are kept on disk with their ETag / Last-Modified validators,
+# so a re-run sends conditional requests and reuses the stored result on a
+# 304; bump PAGE_CACHE_VERSION whenever analyze_page changes what it records
+PAGE_CACHE_DIR = os.path.join(
+    os.path.expanduser(os.environ.get('SEO_ANALYZER_CACHE_DIR', os.path.join('~', '.cache', 'seo_analyzer'))), 'pages'
+)
+PAGE_CACHE_VERSION = 2
+
+def _page_cache_path(cache_dir: str, url: str) -> str:
+    """Cache file for url inside cache_dir"""
+    return os.path.join(cache_dir, f'{hashlib.sha256(url.encode()).hexdigest()}.json')
+
+# Columns of the bulk CSV export, in the order _csv_row fills them
+CSV_COLUMNS = (
+    'URL', 'Status Code', 'Response Time (s)', 'Page Size (bytes)', 'Title', 'Title Length',
+    'Meta Description', 'Meta Description Length', 'H1 Count', 'H2 Count', 'Word Count',
+    'Image Count', 'Images Without Alt', 'Internal Links', 'External Links', 'HTTPS',
+    'Canonical URL', 'Structured Data Count', 'SEO Score', 'Issues', 'Warnings'
+)
+
+def _csv_row(result: Dict[str, Any]) -> tuple:
+    """One CSV_COLUMNS row for a successful page result"""
+    return (
+        result.get('url', ''),
+        result.get('status_code', ''),
+        result.get('response_time', ''),
+        result.get('page_size', ''),
+        result.get('title', ''),
+        result.get('title_length', ''),
+        result.get('meta_description', ''),
+        result.get('meta_description_length', ''),
+        result.get('h1_count', ''),
+        result.get('h2_count', ''),
+        result.get('word_count', ''),
+        result.get('image_count', ''),
+        result.get('images_without_alt', ''),
+        result.get('internal_links', ''),
+        result.get('external_links', ''),
+        result.get('https', ''),
+        result.get('canonical_url', ''),
+        result.get('structured_data_count', ''),
+        result.get('score', ''),
+        '; '.join(result.get('issues', [])),
+        '; '.join(result.get('warnings', []))
+    )
+
+# Page-supplied text is escaped before it goes into the HTML report
+_HTML_ESCAPE_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})
+
+def _esc(value: Any) -> str:
+    """HTML-escape value for report text and double-quoted attributes"""
+    return str(value).translate(_HTML_ESCAPE_TABLE)
+
+def _score_class(score: int) -> str:
+    """Get CSS class for score"""
+    if score >= 80:
+        return 'good'
+    elif score >= 50:
+        return 'warning'
+    else:
+        return 'error'
+
+class SharedSSLAdapter(HTTPAdapter):
+    """HTTPAdapter whose verified HTTPS connections all use one preloaded TLS context"""
+
+    def __init__(self, ssl_context: ssl.SSLContext, ca_bundle: str, **kwargs):
+        self.ssl_context = ssl_context
+        self.ca_bundle = ca_bundle
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **pool_kwargs):
+        pool_kwargs['ssl_context'] = self.ssl_context
+        super().init_poolmanager(*args, **pool_kwargs)
+
+    def _uses_shared_context(self, verify) -> bool:
+        """Whether a request's verify setting is the trust the shared context holds"""
+        return verify is True or verify == self.ca_bundle
+
+    def build_connection_pool_key_attributes(self, request, verify, cert=None):
+        host_params, pool_kwargs = super().build_connection_pool_key_attributes(request, verify, cert)
+        if not self._uses_shared_context(verify):
+            # Any other trust setting gets pools and a context of its own, as plain requests would
+            pool_kwargs['ssl_context'] = None
+        return host_params, pool_kwargs
+
+    def cert_verify(self, conn, url, verify, cert):
+        super().cert_verify(conn, url, verify, cert)
+        if url.lower().startswith('https') and self._uses_shared_context(verify):
+            # The shared context already trusts this bundle; naming it again would
+            # make urllib3 load it into the context for every new connection
+            conn.ca_certs = None
+            conn.ca_cert_dir = None
+
 class BulkAnalyzer:
-    def __init__(self):
+    # One configured session per process, so analyzers created per request
+    # still reuse the kept-alive connections of the ones before them
+    _session = None
+    _session_lock = Lock()
+
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        """Shared HTTP session, built on first use"""
+        with cls._session_lock:
+            if cls._session is None:
+                # requests advertises gzip and deflate, plus br whenever a brotli decoder is
+                # installed (it is in requirements.txt); bodies arrive already decompressed
+                session = requests.Session()
+                session.headers.update({
+                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+                })
+                
+                # Size the pool well past the worker count so parallel fetches to one
+                # host reuse kept-alive connections instead of reconnecting; transient
+                # 5xx answers are retried, and the last response is still returned
+                adapter_options = dict(
+                    pool_connections=POOL_CONNECTIONS,
+                    pool_maxsize=POOL_MAXSIZE,
+                    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(500, 502, 503, 504), raise_on_status=False)
+                )
+                
+                # HTTPS connections share one TLS context, so the CA bundle is
+                # loaded once rather than for each new connection
+                ssl_context, ca_bundle = _shared_ssl_context()
+                if ssl_context is not None:
+                    adapter = SharedSSLAdapter(ssl_context, ca_bundle, **adapter_options)
+                else:
+                    adapter = HTTPAdapter(**adapter_options)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                cls._session = session
+            return cls._session
+
+    def __init__(self, page_cache_dir: Optional[str] = PAGE_CACHE_DIR):
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
         if self.openai_api_key:
             self.client = openai.OpenAI(api_key=self.openai_api_key)
         else:
             self.client = None
         
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
+        self.session = self._get_session()
+        
+        # Where analyzed pages are remembered for conditional re-fetching; None disables it
+        self.page_cache_dir = page_cache_dir
         self.results_lock = Lock()
         self.results = []
 
@@ -54,69 +416,100 @@ class BulkAnalyzer:
         
         base_url = f"https://{domain}" if not domain.startswith('http') else domain
         
-        for path in common_paths:
-            try:
-                url = urljoin(base_url, path)
-                response = self.session.get(url, timeout=10)
-                if response.status_code == 200 and 'xml' in response.headers.get('content-type', ''):
+        # Probe every location and robots.txt at once; results are read back in
+        # path order so the discovered list does not depend on response timing
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(common_paths) + 1) as executor:
+            probes = [
+                executor.submit(self._probe_sitemap, urljoin(base_url, path)) for path in common_paths
+            ]
+            robots = executor.submit(self.session.get, urljoin(base_url, '/robots.txt'), timeout=10)
+            
+            for probe in probes:
+                url = probe.result()
+                if url:
                     sitemap_urls.append(url)
                     print(f"✅ Found sitemap: {url}")
+            
+            # Check robots.txt for sitemap references
+            try:
+                response = robots.result()
+                if response.status_code == 200:
+                    for line in response.text.split('\n'):
+                        if line.lower().startswith('sitemap:'):
+                            sitemap_url = line.split(':', 1)[1].strip()
+                            if sitemap_url not in sitemap_urls:
+                                sitemap_urls.append(sitemap_url)
+                                print(f"✅ Found sitemap in robots.txt: {sitemap_url}")
             except:
-                continue
+                pass
         
-        # Check robots.txt for sitemap references
+        return sitemap_urls
+
+    def _probe_sitemap(self, url: str) -> Optional[str]:
+        """Return url if it serves XML, checked with HEAD so no sitemap body is downloaded"""
         try:
-            robots_url = urljoin(base_url, '/robots.txt')
-            response = self.session.get(robots_url, timeout=10)
-            if response.status_code == 200:
-                for line in response.text.split('\n'):
-                    if line.lower().startswith('sitemap:'):
-                        sitemap_url = line.split(':', 1)[1].strip()
-                        if sitemap_url not in sitemap_urls:
-                            sitemap_urls.append(sitemap_url)
-                            print(f"✅ Found sitemap in robots.txt: {sitemap_url}")
+            response = self.session.head(url, timeout=5, allow_redirects=True)
+            if response.status_code in (405, 501):
+                # Servers without HEAD support get a streamed GET that is closed unread
+                response = self.session.get(url, timeout=10, stream=True)
+                response.close()
+            if response.status_code == 200 and 'xml' in response.headers.get('content-type', ''):
+                return url
         except:
             pass
-        
-        return sitemap_urls
+        return None
 
-    def parse_sitemap(self, sitemap_url: str) -> List[str]:
-        """Parse sitemap XML and extract URLs"""
+    def parse_sitemap(self, sitemap_url: str, seen: Optional[set] = None, limit: int = 0) -> List[str]:
+        """Parse sitemap XML and extract the URLs not already in seen, stopping once seen holds limit URLs (0 for no limit)"""
         urls = []
+        if seen is None:
+            seen = set()
         
         try:
             print(f"📄 Parsing sitemap: {sitemap_url}")
             response = self.session.get(sitemap_url, timeout=15)
             response.raise_for_status()
             
-            # Parse XML
-            root = ET.fromstring(response.content)
+            content = response.content
+            if not SITEMAP_ROOT_RE.match(content.lstrip(b'\xef\xbb\xbf')):
+                print(f"⚠️ Not a sitemap, skipping: {sitemap_url}")
+                return urls
             
-            # Handle different sitemap formats
-            namespaces = {
-                'sitemap': 'http://www.sitemaps.org/schemas/sitemap/0.9',
-                'news': 'http://www.google.com/schemas/sitemap-news/0.9',
-                'image': 'http://www.google.com/schemas/sitemap-image/1.1'
-            }
+            # Stream the XML: each <loc> is read as its entry closes and the
+            # entry is then dropped, so memory stays flat on 50k-URL sitemaps;
+            # entities are never expanded and a truncated file yields what it has
+            locs = []
+            sub_sitemaps = []
+            for _, element in etree.iterparse(BytesIO(content), events=('end',), tag=SITEMAP_TAGS,
+                                              resolve_entities=False, huge_tree=False, recover=True):
+                if element.tag == SITEMAP_LOC:
+                    parent = element.getparent()
+                    if parent is not None and element.text:
+                        if parent.tag == SITEMAP_ENTRY:
+                            sub_sitemaps.append(element.text.strip())
+                        elif parent.tag == SITEMAP_URL:
+                            loc = element.text.strip()
+                            if loc not in seen:
+                                seen.add(loc)
+                                locs.append(loc)
+                                if limit and len(seen) >= limit:
+                                    break
+                else:
+                    element.clear(keep_tail=True)
+                    while element.getprevious() is not None:
+                        del element.getparent()[0]
             
             # Check if it's a sitemap index
-            sitemaps = root.findall('.//sitemap:sitemap', namespaces)
-            if sitemaps:
-                print(f"📋 Found sitemap index with {len(sitemaps)} sitemaps")
-                for sitemap in sitemaps:
-                    loc = sitemap.find('sitemap:loc', namespaces)
-                    if loc is not None:
-                        # Recursively parse sub-sitemaps
-                        sub_urls = self.parse_sitemap(loc.text)
-                        urls.extend(sub_urls)
+            if sub_sitemaps:
+                print(f"📋 Found sitemap index with {len(sub_sitemaps)} sitemaps")
+                for sub_sitemap in sub_sitemaps:
+                    # Recursively parse sub-sitemaps, skipping the rest once the limit is reached
+                    if limit and len(seen) >= limit:
+                        break
+                    urls.extend(self.parse_sitemap(sub_sitemap, seen, limit))
             else:
                 # Regular sitemap with URLs
-                url_elements = root.findall('.//sitemap:url', namespaces)
-                for url_elem in url_elements:
-                    loc = url_elem.find('sitemap:loc', namespaces)
-                    if loc is not None:
-                        urls.append(loc.text)
-                
+                urls = locs
                 print(f"📊 Extracted {len(urls)} URLs from sitemap")
         
         except Exception as e:
@@ -127,202 +520,168 @@ class BulkAnalyzer:
     def analyze_single_url(self, url: str) -> Dict[str, Any]:
         """Analyze a single URL for bulk analysis"""
         try:
-            start_time = time.time()
-            response = self.session.get(url, timeout=10)
-            response_time = time.time() - start_time
+            body, response_info = self._fetch_page(url)
+            if body is None:
+                return response_info
+            result = analyze_page(url, body, response_info)
+            self._store_page(url, response_info, result)
+            return result
+            
+        except Exception as e:
+            return {
+                'url': url,
+                'status': 'error',
+                'error': str(e),
+                'status_code': 0
+            }
+
+    def _fetch_page(self, url: str) -> Tuple[Optional[bytes], Dict[str, Any]]:
+        """Download a page; returns (body, response details), or (None, error result) when there is nothing to analyze"""
+        # Revalidate a previously analyzed page instead of downloading it again
+        cached = self._cached_page(url)
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        
+        start_time = time.time()
+        
+        # Stream so non-HTML assets listed in sitemaps and runaway pages are never fully downloaded
+        response = self.session.get(url, timeout=10, stream=True, headers=headers)
+        try:
+            if response.status_code == 304 and cached:
+                # Unchanged since it was analyzed, so the stored result stands without a download or parse
+                return None, dict(cached['analysis'], response_time=time.time() - start_time)
             
             if response.status_code != 200:
-                return {
+                return None, {
                     'url': url,
                     'status': 'error',
                     'status_code': response.status_code,
                     'error': f'HTTP {response.status_code}'
                 }
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract basic SEO data
-            analysis = {
-                'url': url,
-                'status': 'success',
-                'status_code': response.status_code,
-                'response_time': response_time,
-                'page_size': len(response.content),
-                
-                # SEO Elements
-                'title': soup.find('title').get_text().strip() if soup.find('title') else '',
-                'title_length': 0,
-                'meta_description': '',
-                'meta_description_length': 0,
-                'h1_count': len(soup.find_all('h1')),
-                'h2_count': len(soup.find_all('h2')),
-                'h3_count': len(soup.find_all('h3')),
-                
-                # Content Analysis
-                'word_count': len(soup.get_text().split()),
-                'image_count': len(soup.find_all('img')),
-                'images_without_alt': 0,
-                'internal_links': 0,
-                'external_links': 0,
-                
-                # Technical
-                'canonical_url': '',
-                'robots_meta': '',
-                'structured_data_count': 0,
-                'https': url.startswith('https'),
-                
-                # Issues
-                'issues': [],
-                'warnings': [],
-                'score': 0
-            }
-            
-            # Calculate title length
-            if analysis['title']:
-                analysis['title_length'] = len(analysis['title'])
-            
-            # Extract meta description
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            if meta_desc:
-                analysis['meta_description'] = meta_desc.get('content', '')
-                analysis['meta_description_length'] = len(analysis['meta_description'])
-            
-            # Extract canonical URL
-            canonical = soup.find('link', rel='canonical')
-            if canonical:
-                analysis['canonical_url'] = canonical.get('href', '')
-            
-            # Extract robots meta
-            robots_meta = soup.find('meta', attrs={'name': 'robots'})
-            if robots_meta:
-                analysis['robots_meta'] = robots_meta.get('content', '')
-            
-            # Count images without alt text
-            images = soup.find_all('img')
-            analysis['images_without_alt'] = len([img for img in images if not img.get('alt')])
-            
-            # Count links
-            domain = urlparse(url).netloc
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                if href.startswith('http'):
-                    if urlparse(href).netloc == domain:
-                        analysis['internal_links'] += 1
-                    else:
-                        analysis['external_links'] += 1
-                elif href.startswith('/'):
-                    analysis['internal_links'] += 1
-            
-            # Count structured data
-            structured_data = soup.find_all('script', type='application/ld+json')
-            analysis['structured_data_count'] = len(structured_data)
-            
-            # Basic SEO scoring and issue detection
-            score = 0
-            
-            # Title analysis
-            if not analysis['title']:
-                analysis['issues'].append('Missing title tag')
-            elif analysis['title_length'] < 30:
-                analysis['warnings'].append('Title too short')
-            elif analysis['title_length'] > 60:
-                analysis['warnings'].append('Title too long')
-            else:
-                score += 20
-            
-            # Meta description analysis
-            if not analysis['meta_description']:
-                analysis['issues'].append('Missing meta description')
-            elif analysis['meta_description_length'] < 120:
-                analysis['warnings'].append('Meta description too short')
-            elif analysis['meta_description_length'] > 160:
-                analysis['warnings'].append('Meta description too long')
-            else:
-                score += 20
-            
-            # H1 analysis
-            if analysis['h1_count'] == 0:
-                analysis['issues'].append('Missing H1 tag')
-            elif analysis['h1_count'] > 1:
-                analysis['warnings'].append('Multiple H1 tags')
-            else:
-                score += 15
-            
-            # Image analysis
-            if analysis['images_without_alt'] > 0:
-                analysis['warnings'].append(f'{analysis["images_without_alt"]} images without alt text')
-            else:
-                score += 15
-            
-            # Content analysis
-            if analysis['word_count'] < 300:
-                analysis['warnings'].append('Low word count')
-            else:
-                score += 15
-            
-            # Technical analysis
-            if not analysis['canonical_url']:
-                analysis['warnings'].append('Missing canonical URL')
-            else:
-                score += 10
-            
-            if not analysis['https']:
-                analysis['issues'].append('Not using HTTPS')
-            else:
-                score += 5
-            
-            analysis['score'] = score
-            
-            return analysis
+            content_type = response.headers.get('content-type', '').lower()
+            if content_type and 'html' not in content_type:
+                return None, {
+                    'url': url,
+                    'status': 'skipped',
+                    'status_code': response.status_code,
+                    'content_type': content_type,
+                    'error': f'Not an HTML page ({content_type})'
+                }
             
-        except Exception as e:
-            return {
-                'url': url,
-                'status': 'error',
-                'error': str(e),
-                'status_code': 0
-            }
+            body = bytearray()
+            for chunk in response.iter_content(65536):
+                body += chunk
+                if len(body) > MAX_PAGE_BYTES:
+                    break
+            # The size is the decoded bytes read; Content-Length would give the
+            # compressed size of a gzip or br response
+            page_size = len(body)
+            body = bytes(body[:MAX_PAGE_BYTES])
+        finally:
+            response.close()
+        
+        response_time = time.time() - start_time
+        
+        return body, {
+            'status_code': response.status_code,
+            'response_time': response_time,
+            'page_size': page_size,
+            'etag': response.headers.get('etag'),
+            'last_modified': response.headers.get('last-modified')
+        }
+
+    def _cached_page(self, url: str) -> Optional[Dict[str, Any]]:
+        """Stored validators and analysis for url, if this analyzer version saved one"""
+        if not self.page_cache_dir:
+            return None
+        try:
+            with open(_page_cache_path(self.page_cache_dir, url), encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cached.get('version') != PAGE_CACHE_VERSION or cached.get('url') != url:
+            return None
+        return cached
 
-    def bulk_analyze_urls(self, urls: List[str], max_workers: int = 10) -> List[Dict[str, Any]]:
-        """Analyze multiple URLs in parallel"""
+    def _store_page(self, url: str, response_info: Dict[str, Any], result: Dict[str, Any]):
+        """Remember a successful analysis, best effort, when the response carried a validator"""
+        if not self.page_cache_dir or result.get('status') != 'success':
+            return
+        if not (response_info.get('etag') or response_info.get('last_modified')):
+            return
+        
+        path = _page_cache_path(self.page_cache_dir, url)
+        try:
+            os.makedirs(self.page_cache_dir, exist_ok=True)
+            # Write then rename so a concurrent reader never sees a partial file
+            temp_path = f'{path}.{os.getpid()}.{get_ident()}.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'version': PAGE_CACHE_VERSION,
+                    'url': url,
+                    'etag': response_info.get('etag'),
+                    'last_modified': response_info.get('last_modified'),
+                    'analysis': result
+                }, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"⚠️ Warning: Could not cache page analysis: {str(e)}")
+
+    def bulk_analyze_urls(self, urls: List[str], max_workers: int = 10, parse_processes: int = 0) -> List[Dict[str, Any]]:
+        """Analyze multiple URLs in parallel; parse_processes > 0 moves page parsing into that many worker processes"""
         print(f"\n🚀 Starting bulk analysis of {len(urls)} URLs...")
         print(f"⚡ Using {max_workers} parallel workers")
         
-        results = []
+        results = asyncio.run(self.analyze_urls_async(urls, max_workers, parse_processes))
+        
+        print(f"✅ Bulk analysis completed!")
+        return results
+
+    async def analyze_urls_async(self, urls: List[str], max_workers: int = 10, parse_processes: int = 0) -> List[Dict[str, Any]]:
+        """Analyze multiple URLs concurrently from a single event loop, returning results in input order
+        
+        With parse_processes > 0 the downloads stay on the thread pool and the
+        CPU-bound parsing runs in a process pool, so it is not held to one core.
+        """
+        loop = asyncio.get_running_loop()
         completed = 0
         
-        def update_progress(future):
+        async def analyze(url: str) -> Dict[str, Any]:
             nonlocal completed
+            try:
+                if parse_pool is None:
+                    result = await loop.run_in_executor(executor, self.analyze_single_url, url)
+                else:
+                    body, response_info = await loop.run_in_executor(executor, self._fetch_page, url)
+                    if body is None:
+                        result = response_info
+                    else:
+                        result = await loop.run_in_executor(parse_pool, analyze_page, url, body, response_info)
+                        self._store_page(url, response_info, result)
+            except Exception as e:
+                result = {
+                    'url': url,
+                    'status': 'error',
+                    'error': str(e)
+                }
+            
+            # Progress is reported from the loop, so the counter needs no lock
             completed += 1
             if completed % 10 == 0 or completed == len(urls):
                 print(f"📊 Progress: {completed}/{len(urls)} URLs analyzed ({completed/len(urls)*100:.1f}%)")
+            return result
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            future_to_url = {executor.submit(self.analyze_single_url, url): url for url in urls}
-            
-            # Add progress callback
-            for future in future_to_url:
-                future.add_done_callback(update_progress)
-            
-            # Collect results
-            for future in concurrent.futures.as_completed(future_to_url):
-                try:
-                    result = future.result()
-                    results.append(result)
-                except Exception as e:
-                    url = future_to_url[future]
-                    results.append({
-                        'url': url,
-                        'status': 'error',
-                        'error': str(e)
-                    })
-        
-        print(f"✅ Bulk analysis completed!")
-        return results
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor, \
+                (concurrent.futures.ProcessPoolExecutor(max_workers=parse_processes) if parse_processes > 0 else nullcontext()) as parse_pool:
+            return await asyncio.gather(*[analyze(url) for url in urls])
 
-    def analyze_website_sitemap(self, domain: str, max_urls: int = 100) -> Dict[str, Any]:
-        """Analyze a website's sitemap"""
+    def analyze_website_sitemap(self, domain: str, max_urls: int = 100, sample_seed: Optional[int] = None, parse_processes: int = 0) -> Dict[str, Any]:
+        """Analyze a website's sitemap, taking its first max_urls URLs or, with sample_seed, a reproducible sample"""
         print(f"\n🗺️ Starting sitemap analysis for: {domain}")
         
         # Discover sitemaps
@@ -335,19 +694,25 @@ class BulkAnalyzer:
                 'sitemaps_found': 0
             }
         
-        # Extract URLs from sitemaps
-        all_urls = []
+        # Extract unique URLs from sitemaps, in sitemap order, until max_urls are
+        # collected; a sample needs every URL first, so it collects without a limit
+        limit = max_urls if sample_seed is None else 0
+        seen = set()
+        unique_urls = []
         for sitemap_url in sitemap_urls:
-            urls = self.parse_sitemap(sitemap_url)
-            all_urls.extend(urls)
+            unique_urls.extend(self.parse_sitemap(sitemap_url, seen, limit))
+            if limit and len(unique_urls) >= limit:
+                break
         
-        # Remove duplicates and limit
-        unique_urls = list(set(all_urls))[:max_urls]
+        total_urls_found = len(unique_urls)
+        if sample_seed is not None and total_urls_found > max_urls:
+            # Sorted first so the same seed picks the same pages however the sitemap is ordered
+            unique_urls = random.Random(sample_seed).sample(sorted(unique_urls), max_urls)
         
-        print(f"📊 Found {len(all_urls)} total URLs, analyzing {len(unique_urls)} unique URLs")
+        print(f"📊 Found {total_urls_found} unique URLs (limit {max_urls}), analyzing {len(unique_urls)} of them")
         
         # Analyze URLs
-        results = self.bulk_analyze_urls(unique_urls)
+        results = self.bulk_analyze_urls(unique_urls, parse_processes=parse_processes)
         
         # Generate summary
         summary = self._generate_bulk_summary(results)
@@ -356,7 +721,7 @@ class BulkAnalyzer:
             'domain': domain,
             'sitemaps_found': len(sitemap_urls),
             'sitemap_urls': sitemap_urls,
-            'total_urls_found': len(all_urls),
+            'total_urls_found': total_urls_found,
             'urls_analyzed': len(unique_urls),
             'results': results,
             'summary': summary,
@@ -373,34 +738,78 @@ class BulkAnalyzer:
         if not successful_results:
             return {'error': 'No successful analyses'}
         
+        # One pass over the successful pages feeds every counter and total
+        missing_title = missing_meta_desc = missing_h1 = multiple_h1 = without_https = 0
+        low_content = no_images = images_no_alt = 0
+        high_score = medium_score = low_score = 0
+        total_response_time = total_page_size = total_word_count = total_score = 0
+        
+        for r in successful_results:
+            if not r.get('title'):
+                missing_title += 1
+            if not r.get('meta_description'):
+                missing_meta_desc += 1
+            
+            h1_count = r.get('h1_count', 0)
+            if h1_count == 0:
+                missing_h1 += 1
+            elif h1_count > 1:
+                multiple_h1 += 1
+            
+            if not r.get('https', True):
+                without_https += 1
+            
+            total_response_time += r.get('response_time', 0)
+            total_page_size += r.get('page_size', 0)
+            
+            word_count = r.get('word_count', 0)
+            total_word_count += word_count
+            if word_count < 300:
+                low_content += 1
+            
+            if r.get('image_count', 0) == 0:
+                no_images += 1
+            if r.get('images_without_alt', 0) > 0:
+                images_no_alt += 1
+            
+            score = r.get('score', 0)
+            total_score += score
+            if score >= 80:
+                high_score += 1
+            elif score >= 50:
+                medium_score += 1
+            else:
+                low_score += 1
+        
+        successful = len(successful_results)
         summary = {
             'total_pages': len(results),
-            'successful_analyses': len(successful_results),
-            'failed_analyses': len(results) - len(successful_results),
-            'success_rate': len(successful_results) / len(results) * 100,
+            'successful_analyses': successful,
+            'failed_analyses': len(results) - successful,
+            'success_rate': successful / len(results) * 100,
             
             # SEO Issues Summary
-            'pages_missing_title': len([r for r in successful_results if not r.get('title')]),
-            'pages_missing_meta_desc': len([r for r in successful_results if not r.get('meta_description')]),
-            'pages_missing_h1': len([r for r in successful_results if r.get('h1_count', 0) == 0]),
-            'pages_multiple_h1': len([r for r in successful_results if r.get('h1_count', 0) > 1]),
-            'pages_without_https': len([r for r in successful_results if not r.get('https', True)]),
+            'pages_missing_title': missing_title,
+            'pages_missing_meta_desc': missing_meta_desc,
+            'pages_missing_h1': missing_h1,
+            'pages_multiple_h1': multiple_h1,
+            'pages_without_https': without_https,
             
             # Performance Summary
-            'avg_response_time': sum(r.get('response_time', 0) for r in successful_results) / len(successful_results),
-            'avg_page_size': sum(r.get('page_size', 0) for r in successful_results) / len(successful_results),
-            'avg_word_count': sum(r.get('word_count', 0) for r in successful_results) / len(successful_results),
+            'avg_response_time': total_response_time / successful,
+            'avg_page_size': total_page_size / successful,
+            'avg_word_count': total_word_count / successful,
             
             # Score Distribution
-            'avg_seo_score': sum(r.get('score', 0) for r in successful_results) / len(successful_results),
-            'high_score_pages': len([r for r in successful_results if r.get('score', 0) >= 80]),
-            'medium_score_pages': len([r for r in successful_results if 50 <= r.get('score', 0) < 80]),
-            'low_score_pages': len([r for r in successful_results if r.get('score', 0) < 50]),
+            'avg_seo_score': total_score / successful,
+            'high_score_pages': high_score,
+            'medium_score_pages': medium_score,
+            'low_score_pages': low_score,
             
             # Content Analysis
-            'pages_low_content': len([r for r in successful_results if r.get('word_count', 0) < 300]),
-            'pages_no_images': len([r for r in successful_results if r.get('image_count', 0) == 0]),
-            'pages_images_no_alt': len([r for r in successful_results if r.get('images_without_alt', 0) > 0]),
+            'pages_low_content': low_content,
+            'pages_no_images': no_images,
+            'pages_images_no_alt': images_no_alt,
         }
         
         return summary
@@ -411,39 +820,15 @@ class BulkAnalyzer:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"bulk_seo_analysis_{timestamp}.csv"
         
-        # Prepare data for CSV
-        csv_data = []
-        for result in results:
-            if result.get('status') == 'success':
-                csv_row = {
-                    'URL': result.get('url', ''),
-                    'Status Code': result.get('status_code', ''),
-                    'Response Time (s)': result.get('response_time', ''),
-                    'Page Size (bytes)': result.get('page_size', ''),
-                    'Title': result.get('title', ''),
-                    'Title Length': result.get('title_length', ''),
-                    'Meta Description': result.get('meta_description', ''),
-                    'Meta Description Length': result.get('meta_description_length', ''),
-                    'H1 Count': result.get('h1_count', ''),
-                    'H2 Count': result.get('h2_count', ''),
-                    'Word Count': result.get('word_count', ''),
-                    'Image Count': result.get('image_count', ''),
-                    'Images Without Alt': result.get('images_without_alt', ''),
-                    'Internal Links': result.get('internal_links', ''),
-                    'External Links': result.get('external_links', ''),
-                    'HTTPS': result.get('https', ''),
-                    'Canonical URL': result.get('canonical_url', ''),
-                    'Structured Data Count': result.get('structured_data_count', ''),
-                    'SEO Score': result.get('score', ''),
-                    'Issues': '; '.join(result.get('issues', [])),
-                    'Warnings': '; '.join(result.get('warnings', []))
-                }
-                csv_data.append(csv_row)
+        # One tuple per successful page, written straight out with the csv module
+        rows = [_csv_row(result) for result in results if result.get('status') == 'success']
         
         # Write CSV
-        if csv_data:
-            df = pd.DataFrame(csv_data)
-            df.to_csv(filename, index=False)
+        if rows:
+            with open(filename, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f, lineterminator=os.linesep)
+                writer.writerow(CSV_COLUMNS)
+                writer.writerows(rows)
             print(f"📊 Results exported to: {filename}")
         
         return filename
@@ -457,10 +842,35 @@ class BulkAnalyzer:
         # Calculate percentages
         total_pages = summary.get('total_pages', 1)
         
+        # Table rows for the first 50 results, joined once before the page template
+        shown = results[:50]
+        score_classes = [_score_class(result.get('score', 0)) for result in shown]
+        rows = []
+        for result, score_class in zip(shown, score_classes):
+            url = result.get('url', '')
+            rows.append(f'''
+                            <tr class="{'success' if result.get('status') == 'success' else 'error'}">
+                                <td class="url-cell">
+                                    <a href="{_esc(url)}" target="_blank">
+                                        {_esc(url[:50])}{'...' if len(url) > 50 else ''}
+                                    </a>
+                                </td>
+                                <td class="score-cell score-{score_class}">{result.get('score', 0)}</td>
+                                <td class="{'good' if 30 <= result.get('title_length', 0) <= 60 else 'warning'}">{result.get('title_length', 0)}</td>
+                                <td class="{'good' if 120 <= result.get('meta_description_length', 0) <= 160 else 'warning'}">{result.get('meta_description_length', 0)}</td>
+                                <td class="{'good' if result.get('word_count', 0) >= 300 else 'warning'}">{result.get('word_count', 0)}</td>
+                                <td class="{'good' if result.get('response_time', 0) < 2 else 'warning'}">{result.get('response_time', 0):.2f}s</td>
+                                <td class="issues-cell">
+                                    {len(result.get('issues', [])) + len(result.get('warnings', []))} issues
+                                </td>
+                            </tr>
+                            ''')
+        rows_html = ''.join(rows)
+        
         html = f"""
         <div class="bulk-analysis-report">
             <h2>🗺️ Bulk SEO Analysis Report</h2>
-            <h3>Domain: {domain}</h3>
+            <h3>Domain: {_esc(domain)}</h3>
             
             <div class="summary-grid">
                 <div class="summary-card">
@@ -544,23 +954,7 @@ class BulkAnalyzer:
                             </tr>
                         </thead>
                         <tbody>
-                            {"".join([f'''
-                            <tr class="{'success' if result.get('status') == 'success' else 'error'}">
-                                <td class="url-cell">
-                                    <a href="{result.get('url', '')}" target="_blank">
-                                        {result.get('url', '')[:50]}{'...' if len(result.get('url', '')) > 50 else ''}
-                                    </a>
-                                </td>
-                                <td class="score-cell score-{self._get_score_class(result.get('score', 0))}">{result.get('score', 0)}</td>
-                                <td class="{'good' if 30 <= result.get('title_length', 0) <= 60 else 'warning'}">{result.get('title_length', 0)}</td>
-                                <td class="{'good' if 120 <= result.get('meta_description_length', 0) <= 160 else 'warning'}">{result.get('meta_description_length', 0)}</td>
-                                <td class="{'good' if result.get('word_count', 0) >= 300 else 'warning'}">{result.get('word_count', 0)}</td>
-                                <td class="{'good' if result.get('response_time', 0) < 2 else 'warning'}">{result.get('response_time', 0):.2f}s</td>
-                                <td class="issues-cell">
-                                    {len(result.get('issues', [])) + len(result.get('warnings', []))} issues
-                                </td>
-                            </tr>
-                            ''' for result in results[:50]])}  <!-- Show first 50 results -->
+                            {rows_html}  <!-- Show first 50 results -->
                         </tbody>
                     </table>
                 </div>
@@ -656,13 +1050,4 @@ class BulkAnalyzer:
         </style>
         """
         
-        return html
-
-    def _get_score_class(self, score: int) -> str:
-        """Get CSS class for score"""
-        if score >= 80:
-            return 'good'
-        elif score >= 50:
-            return 'warning'
-        else:
-            return 'error'
\ No newline at end of file
+        return html
\ No newline at end of file
@@ -5,19 +5,115 @@ Analyzes competitor websites and provides comparative insights
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import urljoin, urlparse
 import json
+from collections import Counter
 import time
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
+import asyncio
 import concurrent.futures
 from threading import Lock
 import openai
 from dotenv import load_dotenv
 import os
 
+from page_parser import parse_html, walk_page
+
 load_dotenv()
 
+SOCIAL_PLATFORMS = ('facebook', 'twitter', 'instagram', 'linkedin', 'youtube', 'tiktok')
+
+# Every site is downloaded at once, up to this many; parsing is CPU-bound and
+# gets at most one worker per core
+MAX_FETCH_WORKERS = 32
+
+# Pages are analyzed from at most this many bytes of HTML
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+
+def _extract_from_tree(tree, domain: str) -> Dict[str, Any]:
+    """Collect the competitor fields from a parsed page in a single walk of the tree"""
+    meta_description = None
+    captured = {'title': [], 'h1': [], 'h2': []}
+    images = internal_links = external_links = 0
+    structured_data = []
+    social_links = []
+    
+    # Visible text is gathered into the page text and into every title or
+    # heading still open; each of those takes its slot on start so nested
+    # headings keep document order
+    texts = []
+    open_captures = []
+    
+    # An absolute link is internal when its host is exactly the page's: the
+    # scheme and domain followed by the end of the href or by a path, query
+    # or fragment, matched as plain prefixes rather than parsing each URL
+    site_roots = (f'http://{domain}', f'https://{domain}')
+    internal_prefixes = tuple(root + end for root in site_roots for end in '/?#')
+    for event, element, text in walk_page(tree):
+        tag = element.tag
+        if tag in captured:
+            if event == 'start':
+                found = captured[tag]
+                found.append('')
+                open_captures.append((found, len(found) - 1, []))
+            elif event == 'end':
+                found, index, parts = open_captures.pop()
+                found[index] = ''.join(parts).strip()
+        if text:
+            texts.append(text)
+            for _, _, parts in open_captures:
+                parts.append(text)
+        if event != 'start':
+            continue
+        
+        if tag == 'a':
+            href = element.get('href')
+            if href is None:
+                continue
+            if href.startswith('http'):
+                if href.startswith(internal_prefixes) or href in site_roots:
+                    internal_links += 1
+                else:
+                    external_links += 1
+            elif href.startswith('/'):
+                internal_links += 1
+            
+            # Social media links
+            href = href.lower()
+            for platform in SOCIAL_PLATFORMS:
+                if platform in href:
+                    social_links.append({
+                        'platform': platform,
+                        'url': href
+                    })
+                    break
+        elif tag == 'img':
+            images += 1
+        elif tag == 'meta':
+            if meta_description is None and element.get('name') == 'description':
+                meta_description = element.get('content', '')
+        elif tag == 'script':
+            if element.get('type') == 'application/ld+json':
+                try:
+                    structured_data.append(json.loads(element.text))
+                except:
+                    pass
+    
+    return {
+        'title': captured['title'][0] if captured['title'] else '',
+        'meta_description': meta_description or '',
+        'h1_tags': captured['h1'],
+        'h2_tags': captured['h2'],
+        'page_text': ''.join(texts),
+        'images': images,
+        'internal_links': internal_links,
+        'external_links': external_links,
+        'structured_data': structured_data,
+        'social_links': social_links
+    }
+
 class CompetitorAnalyzer:
     def __init__(self):
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
@@ -26,96 +122,114 @@ class CompetitorAnalyzer:
         else:
             self.client = None
         
+        # requests advertises gzip and deflate, plus br whenever a brotli decoder is
+        # installed (it is in requirements.txt); bodies arrive already decompressed
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
+        
+        # One kept-alive pool per site for every concurrent download, so repeat
+        # comparisons reuse their TLS connections; gateway errors are retried
+        # and the last response is still returned to raise_for_status
+        adapter = HTTPAdapter(
+            pool_connections=MAX_FETCH_WORKERS,
+            pool_maxsize=MAX_FETCH_WORKERS,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504), raise_on_status=False)
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.results_lock = Lock()
 
     def analyze_competitor(self, url: str) -> Dict[str, Any]:
         """Analyze a single competitor website"""
         try:
-            print(f"🔍 Analyzing competitor: {url}")
-            
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract basic competitor data
-            competitor_data = {
-                'url': url,
-                'domain': urlparse(url).netloc,
-                'title': soup.find('title').get_text().strip() if soup.find('title') else '',
-                'meta_description': '',
-                'h1_tags': [h1.get_text().strip() for h1 in soup.find_all('h1')],
-                'h2_tags': [h2.get_text().strip() for h2 in soup.find_all('h2')],
-                'word_count': len(soup.get_text().split()),
-                'images': len(soup.find_all('img')),
-                'internal_links': 0,
-                'external_links': 0,
-                'response_time': response.elapsed.total_seconds(),
-                'page_size': len(response.content),
-                'https': url.startswith('https'),
-                'structured_data': [],
-                'social_links': [],
-                'keywords': [],
-                'content_topics': []
-            }
-            
-            # Extract meta description
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            if meta_desc:
-                competitor_data['meta_description'] = meta_desc.get('content', '')
-            
-            # Analyze links
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                if href.startswith('http'):
-                    if urlparse(href).netloc == competitor_data['domain']:
-                        competitor_data['internal_links'] += 1
-                    else:
-                        competitor_data['external_links'] += 1
-                elif href.startswith('/'):
-                    competitor_data['internal_links'] += 1
-            
-            # Extract structured data
-            for script in soup.find_all('script', type='application/ld+json'):
-                try:
-                    structured = json.loads(script.string)
-                    competitor_data['structured_data'].append(structured)
-                except:
-                    pass
-            
-            # Detect social media links
-            social_platforms = ['facebook', 'twitter', 'instagram', 'linkedin', 'youtube', 'tiktok']
-            for link in soup.find_all('a', href=True):
-                href = link['href'].lower()
-                for platform in social_platforms:
-                    if platform in href:
-                        competitor_data['social_links'].append({
-                            'platform': platform,
-                            'url': href
-                        })
-                        break
-            
-            # Extract potential keywords from content
-            content_text = soup.get_text().lower()
-            words = content_text.split()
-            word_freq = {}
-            for word in words:
-                if len(word) > 3 and word.isalpha():
-                    word_freq[word] = word_freq.get(word, 0) + 1
-            
-            # Get top keywords
-            competitor_data['keywords'] = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:20]
-            
-            return competitor_data
-            
+            return self._parse_competitor(url, *self._fetch_competitor(url))
         except Exception as e:
             print(f"❌ Error analyzing competitor {url}: {str(e)}")
             return None
 
+    def _fetch_competitor(self, url: str) -> Tuple[bytes, float, int]:
+        """Download a competitor page, returning its first MAX_PAGE_BYTES, response time and size"""
+        print(f"🔍 Analyzing competitor: {url}")
+        
+        # The body is streamed and cut off at the cap, so one huge page
+        # cannot hold megabytes per concurrent download
+        response = self.session.get(url, timeout=10, stream=True)
+        try:
+            response.raise_for_status()
+            body = bytearray()
+            for chunk in response.iter_content(65536):
+                body += chunk
+                if len(body) > MAX_PAGE_BYTES:
+                    break
+            # The size is the decoded bytes read; Content-Length would give the
+            # compressed size of a gzip or br response
+            page_size = len(body)
+            body = bytes(body[:MAX_PAGE_BYTES])
+        finally:
+            response.close()
+        
+        return body, response.elapsed.total_seconds(), page_size
+
+    def _parse_competitor(self, url: str, content: bytes, elapsed: float, page_size: int) -> Dict[str, Any]:
+        """Build the competitor data for a downloaded page"""
+        domain = urlparse(url).netloc
+        page = _extract_from_tree(parse_html(content), domain)
+        
+        # The page text is split once for both the word count and the
+        # keywords; lowercasing first leaves the word boundaries as they are
+        words = page.pop('page_text').lower().split()
+        
+        # Extract basic competitor data
+        competitor_data = {
+            'url': url,
+            'domain': domain,
+            'title': page['title'],
+            'meta_description': page['meta_description'],
+            'h1_tags': page['h1_tags'],
+            'h2_tags': page['h2_tags'],
+            'word_count': len(words),
+            'images': page['images'],
+            'internal_links': page['internal_links'],
+            'external_links': page['external_links'],
+            'response_time': elapsed,
+            'page_size': page_size,
+            'https': url.startswith('https'),
+            'structured_data': page['structured_data'],
+            'social_links': page['social_links'],
+            'keywords': [],
+            'content_topics': []
+        }
+        
+        # Extract potential keywords from content, testing each distinct
+        # word once rather than every occurrence
+        word_freq = Counter(words)
+        for word in [word for word in word_freq if len(word) <= 3 or not word.isalpha()]:
+            del word_freq[word]
+        
+        # Get top keywords
+        competitor_data['keywords'] = word_freq.most_common(20)
+        
+        return competitor_data
+
+    async def _analyze_all(self, urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Download every site concurrently and parse each page as soon as it arrives, keyed by URL in input order"""
+        loop = asyncio.get_running_loop()
+        
+        async def analyze(url: str) -> Dict[str, Any]:
+            try:
+                content, elapsed, page_size = await loop.run_in_executor(fetch_pool, self._fetch_competitor, url)
+                return await loop.run_in_executor(parse_pool, self._parse_competitor, url, content, elapsed, page_size)
+            except Exception as e:
+                print(f"❌ Error analyzing competitor {url}: {str(e)}")
+                return None
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(urls), MAX_FETCH_WORKERS)) as fetch_pool, \
+                concurrent.futures.ThreadPoolExecutor(max_workers=min(len(urls), os.cpu_count() or 1)) as parse_pool:
+            analyzed = await asyncio.gather(*[analyze(url) for url in urls])
+        return {url: result for url, result in zip(urls, analyzed) if result}
+
     def compare_competitors(self, main_url: str, competitor_urls: List[str]) -> Dict[str, Any]:
         """Compare main website with competitors"""
         print(f"\n🏆 Starting competitor analysis...")
@@ -123,20 +237,9 @@ class CompetitorAnalyzer:
         print(f"🎯 Competitors: {', '.join(competitor_urls)}")
         
         all_urls = [main_url] + competitor_urls
-        results = {}
         
-        # Analyze all websites in parallel
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            future_to_url = {executor.submit(self.analyze_competitor, url): url for url in all_urls}
-            
-            for future in concurrent.futures.as_completed(future_to_url):
-                url = future_to_url[future]
-                try:
-                    result = future.result()
-                    if result:
-                        results[url] = result
-                except Exception as e:
-                    print(f"❌ Error processing {url}: {str(e)}")
+        # Fetch all websites at once, overlapping the parsing with the downloads
+        results = asyncio.run(self._analyze_all(all_urls))
         
         if not results:
             return {'error': 'No competitor data could be retrieved'}
@@ -22,6 +22,17 @@ fi
 echo "📦 Installing Python dependencies..."
 pip3 install -r requirements.txt
 
+echo "📚 Downloading NLTK data..."
+python3 scripts/bootstrap_nltk.py
+
+echo "🧩 Precompiling report templates..."
+python3 scripts/compile_templates.py
+
+if command -v mypyc &> /dev/null; then
+    echo "⚙️  Compiling the report builder with mypyc..."
+    mypyc report_builder.py
+fi
+
 echo "📝 Setting up environment file..."
 if [ ! -f .env ]; then
     cp .env.example .env
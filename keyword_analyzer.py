@@ -191,20 +191,17 @@ class KeywordAnalyzer:
         if title_tag:
             metadata['title'] = title_tag.get_text().strip()
         
-        # Meta description
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        if meta_desc:
-            metadata['description'] = meta_desc.get('content', '').strip()
-        
-        # Meta keywords
-        meta_keywords = soup.find('meta', attrs={'name': 'keywords'})
-        if meta_keywords:
-            metadata['keywords'] = meta_keywords.get('content', '').strip()
-        
-        # Headers
-        for i in range(1, 4):
-            headers = soup.find_all(f'h{i}')
-            metadata[f'h{i}'] = [h.get_text().strip() for h in headers]
+        # Meta description and keywords (first tag of each wins)
+        seen = set()
+        for meta in soup.find_all('meta', attrs={'name': ['description', 'keywords']}):
+            name = meta['name']
+            if name not in seen:
+                seen.add(name)
+                metadata[name] = meta.get('content', '').strip()
+        
+        # Headers, collected in a single document pass
+        for header in soup.find_all(['h1', 'h2', 'h3']):
+            metadata[header.name].append(header.get_text().strip())
         
         # Alt texts
         images = soup.find_all('img')
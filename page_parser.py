@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Page Parser
+Decodes fetched HTML into lxml documents and walks their visible text the
+way BeautifulSoup's get_text() read it, for the analyzers that replaced it.
+"""
+
+import codecs
+import re
+from lxml import etree, html as lxml_html
+
+# Elements whose text get_text() leaves out of the page text
+NON_TEXT_TAGS = frozenset(['script', 'style', 'template', 'rt', 'rp'])
+
+# Pages are decoded as BeautifulSoup did: with the charset a <meta> tag
+# declares wherever it sits, else as UTF-8 when they decode as such, else
+# as Windows-1252; pages opening with a BOM are left to libxml2
+META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([-\w.:]+)', re.IGNORECASE)
+BOMS = (codecs.BOM_UTF8, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+
+def parse_html(body: bytes):
+    """Parse page bytes into an lxml document; a blank page gives an empty one"""
+    # A parser per page, as lxml parsers must not be shared between threads
+    parser = None
+    if not body.startswith(BOMS):
+        match = META_CHARSET_RE.search(body)
+        if match:
+            # A declared charset the bytes do not decode with is ignored
+            encoding = match.group(1).decode('ascii')
+            try:
+                body.decode(encoding)
+                parser = lxml_html.HTMLParser(encoding=encoding)
+            except (LookupError, UnicodeDecodeError):
+                pass
+        if parser is None:
+            try:
+                body.decode('utf-8')
+                parser = lxml_html.HTMLParser(encoding='utf-8')
+            except UnicodeDecodeError:
+                parser = lxml_html.HTMLParser(encoding='windows-1252')
+    try:
+        return lxml_html.document_fromstring(body, parser=parser)
+    except etree.ParserError:
+        # Only whitespace or comments, which BeautifulSoup read as an empty page
+        return lxml_html.Element('html')
+
+def walk_page(tree):
+    """Yield (event, element, text) for each node of a parsed page in document order"""
+    # Element text arrives on start and tail on end; comments and processing
+    # instructions arrive once, contributing only their tail. text is None
+    # inside non-text elements and for the root's tail
+    skip_depth = 0
+    for event, element in etree.iterwalk(tree, events=('start', 'end', 'comment', 'pi')):
+        tag = element.tag
+        if event == 'start':
+            if tag in NON_TEXT_TAGS:
+                skip_depth += 1
+            text = None if skip_depth else element.text
+        else:
+            if event == 'end' and tag in NON_TEXT_TAGS:
+                skip_depth -= 1
+            text = None if skip_depth or element is tree else element.tail
+        yield event, element, text
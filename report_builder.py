@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Report Builder
+Pure-Python scoring, status and display helpers behind the advanced HTML report.
+
+Kept free of third-party imports and fully annotated so it can be compiled
+with mypyc (`mypyc report_builder.py`); the compiled extension is then
+imported in place of this file with no change to callers.
+"""
+
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+# Report score-circle classes: below 40 is poor, 40+ average, 60+ good, 80+ excellent
+SCORE_CLASS_THRESHOLDS = (40, 60, 80)
+SCORE_CLASSES = ('poor', 'average', 'good', 'excellent')
+
+# Report metric status classes as (thresholds, classes): a value takes
+# classes[bisect_right(thresholds, value)]; booleans count as 0 and 1
+StatusRule = Tuple[Tuple[float, ...], Tuple[str, ...]]
+
+TITLE_LENGTH_STATUS = ((30, 61), ('warning', 'good', 'warning'))
+META_DESCRIPTION_LENGTH_STATUS = ((120, 161), ('warning', 'good', 'warning'))
+H1_COUNT_STATUS = ((1, 2), ('warning', 'good', 'warning'))
+RESPONSE_TIME_STATUS = ((1, 2), ('excellent', 'good', 'warning'))
+WORD_COUNT_STATUS = ((300,), ('warning', 'good'))
+IMAGES_WITHOUT_ALT_STATUS = ((1,), ('good', 'warning'))
+ENABLED_STATUS = ((1,), ('warning', 'good'))
+HTTPS_STATUS = ((1,), ('error', 'good'))
+
+def status_class(value: float, rule: StatusRule) -> str:
+    """Status class of value under a (thresholds, classes) rule"""
+    thresholds, classes = rule
+    return classes[bisect_right(thresholds, value)]
+
+# Report status key -> (metrics key it classifies, rule)
+REPORT_STATUS_RULES: Dict[str, Tuple[str, StatusRule]] = {
+    'title_length': ('title_length', TITLE_LENGTH_STATUS),
+    'meta_description_length': ('meta_description_length', META_DESCRIPTION_LENGTH_STATUS),
+    'h1_count': ('h1_count', H1_COUNT_STATUS),
+    'canonical_url': ('canonical_url_set', ENABLED_STATUS),
+    'response_time': ('response_time', RESPONSE_TIME_STATUS),
+    'compression': ('compression_enabled', ENABLED_STATUS),
+    'https': ('https_enabled', HTTPS_STATUS),
+    'word_count': ('word_count', WORD_COUNT_STATUS),
+    'images_alt': ('images_without_alt', IMAGES_WITHOUT_ALT_STATUS)
+}
+
+def report_status(metrics: Dict[str, Any]) -> Dict[str, str]:
+    """Status class of every classified metric of one report"""
+    return {key: status_class(metrics[metric], rule) for key, (metric, rule) in REPORT_STATUS_RULES.items()}
+
+def percent(score: int, max_score: int) -> int:
+    """Integer score as a whole percentage of its maximum, rounded half up"""
+    return (200 * score + max_score) // (2 * max_score)
+
+def overall_percent(technical_analysis: Dict[str, Any], content_analysis: Dict[str, Any], performance_analysis: Dict[str, Any]) -> int:
+    """Mean of the technical, content and performance percentages, rounded once at the end"""
+    technical_max = technical_analysis['max_score']
+    content_max = content_analysis['max_score']
+    return percent(
+        100 * (technical_analysis['score'] * content_max + content_analysis['score'] * technical_max)
+        + performance_analysis['score'] * technical_max * content_max,
+        300 * technical_max * content_max
+    )
+
+def score_card(label: str, score: int) -> Dict[str, Any]:
+    """Display values for one report score card"""
+    return {
+        'label': label,
+        'score': score,
+        'css_class': SCORE_CLASSES[bisect_right(SCORE_CLASS_THRESHOLDS, score)],
+        'degrees': score * 18 // 5
+    }
+
+def technical_tabs(metrics: Dict[str, Any], status: Dict[str, str]) -> List[Tuple[str, str, List[Tuple[str, Any, Optional[str]]]]]:
+    """Technical card tabs as (tab id, tab label, [(metric label, display value, status class or None)])"""
+    enabled = ('Disabled', 'Enabled')
+    return [
+        ('technical-basic', 'Basic', [
+            ('Title Length', f"{metrics['title_length']} chars", status['title_length']),
+            ('Meta Description', f"{metrics['meta_description_length']} chars", status['meta_description_length']),
+            ('H1 Tags', metrics['h1_count'], status['h1_count']),
+            ('Canonical URL', 'Set' if metrics['canonical_url_set'] else 'Missing', status['canonical_url']),
+            ('Structured Data', f"{metrics['structured_data_items']} items", None)
+        ]),
+        ('technical-performance', 'Performance', [
+            ('Response Time', f"{metrics['response_time']:.2f}s", status['response_time']),
+            ('Page Size', f"{metrics['page_size_kb']:.1f} KB", None),
+            ('Compression', enabled[metrics['compression_enabled']], status['compression']),
+            ('CSS Files', metrics['css_files'], None),
+            ('JS Files', metrics['js_files'], None)
+        ]),
+        ('technical-security', 'Security', [
+            ('HTTPS', enabled[metrics['https_enabled']], status['https']),
+            ('Security Headers', f"{metrics['security_headers']}/6", None),
+            ('Redirects', metrics['redirects'], None)
+        ])
+    ]
+
+def report_metrics(data: Dict[str, Any], technical_analysis: Dict[str, Any], content_analysis: Dict[str, Any], performance_analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """The page figures the report displays"""
+    # The technical analysis already counted the images missing alt text
+    images = data.get('images', [])
+    images_without_alt = technical_analysis['details']['images_without_alt']
+    content_details = content_analysis['details']
+    performance_metrics = performance_analysis.get('metrics', {})
+    return {
+        'title_length': len(data.get('title', '')),
+        'meta_description_length': len(data.get('meta_description', '')),
+        'h1_count': len(data.get('h1_tags', [])),
+        'canonical_url_set': bool(data.get('canonical_url')),
+        'structured_data_items': len(data.get('structured_data', [])),
+        'response_time': data.get('response_time', 0),
+        'response_time_ms': performance_metrics.get('response_time_ms', 0),
+        'page_size_kb': data.get('page_size', 0) / 1024,
+        'css_files': len(data.get('css_files', [])),
+        'js_files': len(data.get('js_files', [])),
+        'resource_files': performance_metrics.get('css_files', 0) + performance_metrics.get('js_files', 0),
+        'compression_enabled': bool(data.get('compression')),
+        'https_enabled': bool(data.get('https')),
+        'redirects': data.get('redirects') or 0,
+        'security_headers': len(data.get('security_headers', {})),
+        'word_count': content_details.get('word_count', 0),
+        'flesch_reading_ease': content_details.get('flesch_reading_ease', 'N/A'),
+        'detected_language': content_details.get('detected_language', 'Unknown'),
+        'internal_links': len(data.get('internal_links', [])),
+        'external_links': len(data.get('external_links', [])),
+        'images': len(images),
+        'images_with_alt': len(images) - images_without_alt,
+        'images_without_alt': images_without_alt
+    }
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Download the NLTK data used by the analyzers.
+
+Run once at install or image-build time. The analyzers no longer download
+anything on import; set NLTK_DATA to install into (and read from) a custom
+directory.
+"""
+
+import os
+import sys
+
+import nltk
+
+NLTK_RESOURCES = [
+    'vader_lexicon',
+    'stopwords',
+    'punkt',
+    'punkt_tab',
+    'averaged_perceptron_tagger',
+    'wordnet'
+]
+
+def main():
+    """Download every NLTK resource the tool uses"""
+    download_dir = os.environ.get('NLTK_DATA')
+    print(f"📦 Installing NLTK data{f' into {download_dir}' if download_dir else ''}...")
+
+    failed = []
+    for resource in NLTK_RESOURCES:
+        if nltk.download(resource, quiet=True, download_dir=download_dir):
+            print(f"✅ {resource}")
+        else:
+            print(f"❌ {resource}")
+            failed.append(resource)
+
+    if failed:
+        print(f"\n⚠️ Could not download: {', '.join(failed)}")
+        sys.exit(1)
+
+    print("\n🎉 NLTK data installed")
+
+if __name__ == "__main__":
+    main()
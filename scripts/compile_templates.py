@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Precompile the report templates into templates/compiled_templates.zip.
+
+Run once at install or image-build time. The analyzer loads templates from
+the archive when it is newer than every template source, so a fresh process
+skips Jinja's lexer, parser and code generator entirely; re-run after
+editing a template.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from advanced_seo_analyzer import COMPILED_TEMPLATES, REPORT_TEMPLATES
+
+def main():
+    """Compile every .jinja template with the analyzer's environment settings"""
+    print(f"📦 Compiling report templates into {COMPILED_TEMPLATES}...")
+
+    REPORT_TEMPLATES.compile_templates(
+        COMPILED_TEMPLATES,
+        extensions=['jinja'],
+        zip='deflated',
+        log_function=lambda message: print(f"✅ {message}")
+    )
+
+    print("\n🎉 Templates compiled")
+
+if __name__ == "__main__":
+    main()
@@ -78,7 +78,7 @@ setup(
     },
     include_package_data=True,
     package_data={
-        "": ["*.md", "*.txt", "*.yml", "*.yaml"],
+        "": ["*.md", "*.txt", "*.yml", "*.yaml", "templates/*.jinja", "templates/*.css", "templates/*.js"],
     },
     keywords=[
         "seo",
@@ -0,0 +1,65 @@
+// Performance Chart (Chart.js is deferred, so wait for the document to finish parsing)
+document.addEventListener('DOMContentLoaded', function() {
+    const ctx = document.getElementById('performanceChart').getContext('2d');
+    new Chart(ctx, {
+        type: 'radar',
+        data: {
+            labels: REPORT_CHART.labels,
+            datasets: [{
+                label: 'Current Performance',
+                data: REPORT_CHART.values,
+                backgroundColor: 'rgba(43, 89, 255, 0.2)',
+                borderColor: 'rgba(43, 89, 255, 1)',
+                borderWidth: 2,
+                pointBackgroundColor: 'rgba(43, 89, 255, 1)',
+                pointBorderColor: '#fff',
+                pointHoverBackgroundColor: '#fff',
+                pointHoverBorderColor: 'rgba(43, 89, 255, 1)'
+            }]
+        },
+        options: {
+            responsive: true,
+            scales: {
+                r: {
+                    beginAtZero: true,
+                    max: 100,
+                    ticks: {
+                        stepSize: 20
+                    }
+                }
+            },
+            plugins: {
+                legend: {
+                    display: false
+                }
+            }
+        }
+    });
+});
+
+// Tab functionality
+function showTab(tabId) {
+    // Hide all tab contents
+    document.querySelectorAll('.tab-content').forEach(content => {
+        content.classList.remove('active');
+    });
+
+    // Remove active class from all tabs
+    document.querySelectorAll('.tab').forEach(tab => {
+        tab.classList.remove('active');
+    });
+
+    // Show selected tab content
+    document.getElementById(tabId).classList.add('active');
+
+    // Add active class to clicked tab
+    event.target.classList.add('active');
+}
+
+// Animate progress bars on load
+window.addEventListener('load', function() {
+    document.querySelectorAll('.progress-fill').forEach(bar => {
+        const width = bar.getAttribute('data-width');
+        bar.style.width = width + '%';
+    });
+});
@@ -6,13 +6,15 @@ Comprehensive website analysis with competitor analysis, bulk analysis, and adva
 
 import os
 import sys
+import time
 import argparse
+from html import escape
 from datetime import datetime
 from urllib.parse import urlparse
-from typing import List
+from typing import Dict, List, Optional
 
 # Import our modules
-from advanced_seo_analyzer import AdvancedSEOAnalyzer
+from advanced_seo_analyzer import AdvancedSEOAnalyzer, REPORT_FILE_BUFFER
 from competitor_analyzer import CompetitorAnalyzer
 from bulk_analyzer import BulkAnalyzer
 from sitemap_generator import SitemapGenerator
@@ -36,18 +38,16 @@ class UltimateSEOAnalyzer:
         
         print("✅ Website data fetched successfully")
         
-        # Run all analysis modules
+        # Run all analysis modules concurrently
         print("🔧 Running advanced technical analysis...")
-        technical_analysis = self.advanced_analyzer.analyze_technical_seo_advanced(data)
-        
         print("📝 Running advanced content analysis...")
-        content_analysis = self.advanced_analyzer.analyze_content_advanced(data)
-        
         print("⚡ Running performance analysis...")
-        performance_analysis = self.advanced_analyzer.analyze_performance_metrics(data)
-        
         print("🌐 Running domain analysis...")
-        domain_analysis = self.advanced_analyzer.analyze_domain_authority(data['domain'])
+        stages = self.advanced_analyzer.run_analysis_stages(data)
+        technical_analysis = stages['technical']
+        content_analysis = stages['content']
+        performance_analysis = stages['performance']
+        domain_analysis = stages['domain']
         
         # Competitor analysis if requested
         competitor_data = None
@@ -60,32 +60,29 @@ class UltimateSEOAnalyzer:
             data, technical_analysis, content_analysis, performance_analysis
         )
         
-        # Generate ultimate HTML report
+        # Generate ultimate HTML report, streaming it straight into the file
         print("📊 Generating ultimate HTML report...")
-        html_report = self.generate_ultimate_report(
-            data, technical_analysis, content_analysis, performance_analysis, 
-            domain_analysis, ai_recommendations, competitor_data
-        )
-        
-        # Save report
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        domain = urlparse(url).netloc.replace('www.', '')
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        domain = data['domain'].replace('www.', '')
         filename = f"ultimate_seo_report_{domain}_{timestamp}.html"
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(html_report)
+        with open(filename, 'w', encoding='utf-8', buffering=REPORT_FILE_BUFFER) as f:
+            self.write_ultimate_report(
+                f, data, technical_analysis, content_analysis, performance_analysis,
+                domain_analysis, ai_recommendations, competitor_data
+            )
         
         self._print_analysis_summary(technical_analysis, content_analysis, performance_analysis)
         print(f"\n✅ Ultimate report saved as: {filename}")
         print("🌐 Open the file in your browser to view the comprehensive analysis")
 
-    def run_bulk_analysis(self, domain: str, max_urls: int = 100):
+    def run_bulk_analysis(self, domain: str, max_urls: int = 100, sample_seed: Optional[int] = None, parse_processes: int = 0):
         """Run bulk sitemap analysis"""
         print(f"\n🗺️ Starting bulk sitemap analysis for: {domain}")
         print("=" * 80)
         
         # Run bulk analysis
-        bulk_data = self.bulk_analyzer.analyze_website_sitemap(domain, max_urls)
+        bulk_data = self.bulk_analyzer.analyze_website_sitemap(domain, max_urls, sample_seed, parse_processes)
         
         if bulk_data.get('error'):
             print(f"❌ Error: {bulk_data['error']}")
@@ -119,7 +116,7 @@ class UltimateSEOAnalyzer:
         print(f"📊 HTML Report: {html_filename}")
         print(f"📋 CSV Export: {csv_filename}")
 
-    def run_comprehensive_crawl_and_sitemap(self, url: str, max_pages: int = 500, max_depth: int = 5):
+    def run_comprehensive_crawl_and_sitemap(self, url: str, max_pages: int = 500, max_depth: int = 5, parse_processes: int = 0):
         """Run comprehensive website crawling and generate sitemap"""
         print(f"\n🕷️ Starting comprehensive website crawling and sitemap generation for: {url}")
         print("=" * 80)
@@ -150,10 +147,10 @@ class UltimateSEOAnalyzer:
         sample_pages = list(discovery_data['pages'].keys())[:10]  # Analyze first 10 pages
         
         seo_results = []
-        for page_url in sample_pages:
+        fetched_pages = self.advanced_analyzer.fetch_many(sample_pages, parse_processes=parse_processes)
+        for page_url, page_data in fetched_pages.items():
             try:
                 print(f"   🔍 Analyzing: {page_url}")
-                page_data = self.advanced_analyzer.fetch_comprehensive_website_data(page_url)
                 if page_data:
                     technical_analysis = self.advanced_analyzer.analyze_technical_seo_advanced(page_data)
                     content_analysis = self.advanced_analyzer.analyze_content_advanced(page_data)
@@ -226,36 +223,32 @@ class UltimateSEOAnalyzer:
                                 performance_analysis, domain_analysis, ai_recommendations, 
                                 competitor_data=None):
         """Generate the ultimate comprehensive HTML report"""
-        
-        # Get base report from advanced analyzer
-        base_html = self.advanced_analyzer.generate_advanced_html_report(
+        return self.advanced_analyzer.generate_advanced_html_report(
             data, technical_analysis, content_analysis, performance_analysis, 
-            domain_analysis, ai_recommendations
+            domain_analysis, ai_recommendations, **self._ultimate_report_options(competitor_data)
         )
-        
-        # Add competitor analysis if available
+
+    def write_ultimate_report(self, out, data, technical_analysis, content_analysis,
+                              performance_analysis, domain_analysis, ai_recommendations,
+                              competitor_data=None):
+        """Stream the ultimate comprehensive HTML report into an open text file"""
+        self.advanced_analyzer.write_advanced_html_report(
+            out, data, technical_analysis, content_analysis, performance_analysis,
+            domain_analysis, ai_recommendations, **self._ultimate_report_options(competitor_data)
+        )
+
+    def _ultimate_report_options(self, competitor_data=None) -> Dict:
+        """Ultimate branding plus the competitor section, rendered into the base report in one pass"""
+        # Competitor analysis sits just before the recommendations when available
         competitor_section = ""
         if competitor_data and not competitor_data.get('error'):
             competitor_section = self.competitor_analyzer.generate_competitor_report_html(competitor_data)
         
-        # Insert competitor section before recommendations
-        if competitor_section:
-            recommendations_pos = base_html.find('<div class="recommendations">')
-            if recommendations_pos != -1:
-                base_html = (base_html[:recommendations_pos] + 
-                           competitor_section + 
-                           base_html[recommendations_pos:])
-        
-        # Add ultimate branding
-        base_html = base_html.replace(
-            "🔍 Advanced SEO Analysis Report",
-            "🚀 Ultimate SEO Analysis Report"
-        ).replace(
-            "Advanced SEO Analysis Report • Powered by OpenAI GPT-4",
-            "Ultimate SEO Analysis Tool • Advanced AI-Powered Analysis • Competitor Intelligence"
-        )
-        
-        return base_html
+        return {
+            'heading': "🚀 Ultimate SEO Analysis Report",
+            'footer': "Ultimate SEO Analysis Tool • Advanced AI-Powered Analysis • Competitor Intelligence",
+            'extra_section': competitor_section
+        }
 
     def _generate_comprehensive_crawl_report(self, discovery_data: Dict, sitemap_path: str, seo_results: List, url: str) -> str:
         """Generate comprehensive crawl and sitemap report"""
@@ -273,7 +266,7 @@ class UltimateSEOAnalyzer:
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Comprehensive Crawl & Sitemap Report - {urlparse(url).netloc}</title>
+    <title>Comprehensive Crawl & Sitemap Report - {escape(urlparse(url).netloc)}</title>
     <style>
         body {{
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
@@ -494,7 +487,7 @@ class UltimateSEOAnalyzer:
             <div class="seo-results">
                 {"".join([f'''
                 <div class="seo-card">
-                    <h4 title="{result['url']}">{result['url'][:40]}{'...' if len(result['url']) > 40 else ''}</h4>
+                    <h4 title="{escape(result['url'])}">{escape(result['url'][:40])}{'...' if len(result['url']) > 40 else ''}</h4>
                     
                     <div class="metric">
                         <span>Technical SEO:</span>
@@ -557,11 +550,11 @@ class UltimateSEOAnalyzer:
                         {"".join([f'''
                         <tr class="depth-{page.get('depth', 0)}">
                             <td class="url-cell">
-                                <a href="{url}" target="_blank" title="{url}">
-                                    {url[:40]}{'...' if len(url) > 40 else ''}
+                                <a href="{escape(url)}" target="_blank" title="{escape(url)}">
+                                    {escape(url[:40])}{'...' if len(url) > 40 else ''}
                                 </a>
                             </td>
-                            <td>{page.get('title', 'No title')[:30]}{'...' if len(page.get('title', '')) > 30 else ''}</td>
+                            <td>{escape(page.get('title', 'No title')[:30])}{'...' if len(page.get('title', '')) > 30 else ''}</td>
                             <td>{page.get('depth', 0)}</td>
                             <td class="{'good' if page.get('word_count', 0) > 300 else 'warning'}">{page.get('word_count', 0)}</td>
                             <td class="{'good' if page.get('response_time', 0) < 2 else 'warning'}">{page.get('response_time', 0):.2f}s</td>
@@ -710,6 +703,8 @@ def main():
     parser.add_argument('--generate-sitemap', '-s', action='store_true', help='Generate comprehensive sitemap with full website crawling')
     parser.add_argument('--max-pages', '-p', type=int, default=500, help='Maximum pages to crawl for sitemap generation')
     parser.add_argument('--max-depth', '-d', type=int, default=5, help='Maximum crawl depth for sitemap generation')
+    parser.add_argument('--sample-seed', type=int, help='Analyze a reproducible random sample of the sitemap URLs, picked with this seed (bulk analysis)')
+    parser.add_argument('--parse-processes', type=int, default=0, help='Parse fetched pages in this many worker processes (bulk analysis and sitemap crawl)')
     
     args = parser.parse_args()
     
@@ -743,11 +738,11 @@ def main():
         analyzer.run_competitor_analysis(args.url, args.competitors)
     elif args.generate_sitemap:
         # Run comprehensive crawling and sitemap generation
-        analyzer.run_comprehensive_crawl_and_sitemap(args.url, args.max_pages, args.max_depth)
+        analyzer.run_comprehensive_crawl_and_sitemap(args.url, args.max_pages, args.max_depth, args.parse_processes)
     elif args.bulk:
         # Run bulk analysis
         domain = urlparse(args.url).netloc
-        analyzer.run_bulk_analysis(domain, args.max_urls)
+        analyzer.run_bulk_analysis(domain, args.max_urls, args.sample_seed, args.parse_processes)
     else:
         # Run comprehensive single analysis
         include_competitors = bool(args.competitors)